@@ -5,25 +5,95 @@
 
 
 import os
-from tinydb import TinyDB
 
 
 # Retrieve database base path
 BASE_DIR_TIMER = os.path.dirname(os.path.abspath(__file__))
 data_dir_timer = os.path.join(BASE_DIR_TIMER, "data")
 
-# Check if the 'data' folder exists, and create it if it doesn't
-if not os.path.exists(data_dir_timer):
-	os.makedirs(data_dir_timer)
-
 # Build full path to database file
 db_path = os.path.join(data_dir_timer, "timers.json")
 
-# Creating a TinyDB instance
-DB_TIMER = TinyDB(db_path, indent=4)
+# SQLite timer database, replaces the JSON file when the "sqlite" storage backend is used
+sqlite_path = os.path.join(data_dir_timer, "timers.sqlite3")
+
+# Binary snapshot of the timers, used by the "snapshot" storage backend
+snapshot_path = os.path.join(data_dir_timer, "timers.snapshot")
+
+# Journal of the timer changes made since the last save, applied to the database when loading
+journal_path = os.path.join(data_dir_timer, "timers.journal")
+
+# Lateness statistics of the notifications, written when the application exits
+FIRING_STATS_PATH = os.path.join(data_dir_timer, "firing_stats.json")
+
+# TinyDB instance, opened on first use by get_db_timer()
+_db_timer = None
+
+
+def get_db_timer():
+	""" Returns the timer database
+	
+	- The 'data' folder and the database are only created on first use,
+	  importing this module does not access the file system.
+	"""
+	global _db_timer
+	
+	if _db_timer is None:
+		from tinydb import TinyDB
+		
+		# Check if the 'data' folder exists, and create it if it doesn't
+		os.makedirs(data_dir_timer, exist_ok=True)
+		
+		# Creating a TinyDB instance
+		_db_timer = TinyDB(db_path, indent=4)
+	
+	return _db_timer
+
+
+def close_db_timer():
+	""" Closes the timer database
+	
+	- Releases the database file so that it can be replaced,
+	  the database is opened again by the next call to get_db_timer().
+	"""
+	global _db_timer
+	
+	if _db_timer is not None:
+		_db_timer.close()
+		_db_timer = None
+
 
 MAX_CHAR_NAME = 18
 MAX_CHAR_MESSAGE = 80
 
 MAX_RINGS = 20
 MAX_INTERVAL = 300
+
+# Clock used by timers to compute their dates
+# - "monotonic": deadlines in time.monotonic_ns() integers, insensitive to wall-clock changes
+# - "wall": datetime dates based on datetime.now()
+TIMER_CLOCK = "monotonic"
+
+# Scheduling backend of running timers
+# - "heap": priority queue, suited to a few thousand timers
+# - "wheel": hierarchical timing wheel, O(1) insertion and cancellation for very large numbers of timers
+SCHEDULER_BACKEND = "heap"
+
+# Storage backend of the timers
+# - "tinydb": JSON file, read and rewritten entirely
+# - "sqlite": SQLite database in WAL mode, the JSON file is migrated on first use
+# - "snapshot": binary file of fixed-width records, read through a memory map, the JSON file is migrated on first use
+STORAGE_BACKEND = "sqlite"
+
+# Notification dispatcher
+NOTIFY_WORKERS = 1  # Worker threads, a single one keeps the notifications in order
+NOTIFY_QUEUE_SIZE = 64  # Notifications waiting beyond this limit are dropped
+
+# Notification coalescing
+NOTIFY_WINDOW = 0.25  # Seconds during which simultaneous rings are merged into one notification
+NOTIFY_RATE = 1.0  # Maximum number of notifications per second
+NOTIFY_BURST = 3  # Notifications that can be sent at once before the rate applies
+
+# Write-behind journal of the timer changes
+JOURNAL_DEBOUNCE = 2.0  # Seconds between a change and its writing, at most this much is lost on a crash
+JOURNAL_COMPACT_ENTRIES = 500  # Journal entries above which the journal is applied to the database
@@ -0,0 +1,164 @@
+
+"""
+    $ -- Duration -- $
+Formatting of the durations displayed by the timers.
+
+- Durations in whole seconds up to a day are formatted once, then read from a table.
+- Longer or negative whole durations are kept by an LRU cache.
+- Sub-second durations are read from tables, the hours and minutes by whole minute
+  and the seconds by hundredth of a second.
+"""
+
+from datetime import timedelta
+from functools import lru_cache
+
+# Durations in whole seconds read from the table, one day
+TABLE_SIZE = 86400
+
+# Whole durations outside the table kept by the LRU cache
+CACHE_SIZE = 4096
+
+# Durations of the table, formatted on first use
+_table = [None] * (TABLE_SIZE + 1)
+
+# Hours and minutes of each minute of a day, "" for the first minute
+_prefixes = [f"{minute // 60}h {minute % 60}m " if minute >= 60 else f"{minute}m " if minute else ""
+			 for minute in range(TABLE_SIZE // 60 + 1)]
+
+# Whole seconds of a minute
+_whole_seconds = [f"{second:02}s" for second in range(60)]
+
+# Seconds of a minute to the hundredth, formatted on first use, 60.00 s included like the rounding of "{:.2f}"
+_hundredths = [None] * 6001
+
+
+def format_duration(delta: int | float | timedelta, _format=True) -> str | tuple:
+	""" Formats time in hours, minutes and seconds
+	
+	- Whole seconds are displayed on two digits, sub-second durations to the hundredth.
+	- The type of the duration is checked once, types other than int, float and timedelta
+	  are formatted by the generic implementation.
+	
+	:param delta: Duration in seconds
+	:param _format: Output format
+	:return: Time formatted in hours, minutes and seconds
+	"""
+	kind = type(delta)
+	
+	# Raw values
+	if not _format:
+		if kind is int:
+			return split_duration(delta)
+		return _split(delta)
+	
+	if kind is int:
+		if 0 <= delta <= TABLE_SIZE:
+			text = _table[delta]
+			if text is None:
+				text = _table[delta] = _format_int(delta)
+			return text
+		return _format_cached(delta)
+	
+	if kind is float:
+		return _format_float(delta)
+	if kind is timedelta:
+		return _format_float(delta.total_seconds())
+	return _format_generic(delta)
+##
+
+
+#
+@lru_cache(maxsize=CACHE_SIZE)
+def split_duration(seconds: int) -> tuple:
+	""" Returns the hours, minutes and seconds of a whole duration, negative durations are made positive
+	"""
+	return _split(seconds)
+
+
+#
+def _split(delta: int | float | timedelta) -> tuple:
+	""" Returns the hours, minutes and seconds of a duration, negative durations are made positive
+	"""
+	total_seconds = abs(delta.total_seconds() if isinstance(delta, timedelta) else delta)
+	hours, remainder = divmod(total_seconds, 3600)
+	minutes, seconds = divmod(remainder, 60)
+	return hours, minutes, seconds
+##
+
+
+#
+def _format_int(seconds: int) -> str:
+	""" Formats a whole duration
+	"""
+	sign = "- " if seconds < 0 else ""
+	minutes, seconds = divmod(abs(seconds), 60)
+	return sign + _prefix(minutes) + _whole_seconds[seconds]
+
+
+#
+@lru_cache(maxsize=CACHE_SIZE)
+def _format_cached(seconds: int) -> str:
+	""" Formats a whole duration outside the table
+	"""
+	return _format_int(seconds)
+
+
+#
+def _format_float(total_seconds: float) -> str:
+	""" Formats a sub-second duration
+	
+	- The seconds are rounded to the hundredth and read from a table,
+	  they are only formatted when they are too close to half a hundredth to be rounded reliably.
+	"""
+	sign = ""
+	if total_seconds < 0:
+		sign = "- "
+		total_seconds = -total_seconds
+	
+	prefix = _prefix(int(total_seconds // 60))
+	seconds = total_seconds % 60
+	
+	scaled = seconds * 100
+	hundredths = round(scaled)
+	if abs(scaled - hundredths) > 0.499999:
+		return f"{sign}{prefix}{seconds:.2f}s"
+	
+	text = _hundredths[hundredths]
+	if text is None:
+		text = _hundredths[hundredths] = f"{hundredths // 100}.{hundredths % 100:02}s"
+	return sign + prefix + text
+
+
+#
+def _prefix(minutes: int) -> str:
+	""" Returns the hours and minutes of a duration in whole minutes
+	"""
+	if minutes < len(_prefixes):
+		return _prefixes[minutes]
+	return f"{minutes // 60}h {minutes % 60}m "
+##
+
+
+#
+def _format_generic(delta) -> str:
+	""" Formats a duration of any numeric type, such as the integers of numpy
+	"""
+	total_seconds = abs(delta)
+	result = "- " if delta < 0 else ""
+	
+	# Calculation of hours, minutes and seconds
+	hours, remainder = divmod(total_seconds, 3600)
+	minutes, seconds = divmod(remainder, 60)
+	
+	# Convert to string
+	_hours = f"{int(hours)}h"
+	_minutes = f"{int(minutes)}m"
+	_seconds = f"{seconds:02}s" if isinstance(seconds, int) else f"{seconds:.2f}s"
+	
+	# Concatenation excluding null values
+	if hours:
+		return result + f"{_hours} {_minutes} {_seconds}"
+	if minutes:
+		return result + f"{_minutes} {_seconds}"
+	return result + _seconds
+##
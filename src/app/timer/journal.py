@@ -0,0 +1,239 @@
+
+"""
+    $ -- WriteBehindJournal -- $
+Incremental persistence of the timer changes.
+"""
+
+import json
+import os
+import threading
+
+from app.timer import config
+from app.timer.config import JOURNAL_DEBOUNCE, JOURNAL_COMPACT_ENTRIES
+
+
+class WriteBehindJournal:
+	""" Appends the changed timers to a journal file
+	
+	- Timers report their changes with mark(), the changed records are appended
+	  to the journal at most once per debounce interval, in a background thread.
+	- Records are built by mark() in the thread changing the timers, the background thread
+	  only writes them and never reads a timer while it is being modified.
+	- Each line of the journal is a JSON record identified by the timer uid,
+	  or a deletion {"uid": ..., "deleted": true}.
+	- When the journal gets long, it is compacted into the timer storage.
+	- Timers also report their starts, stops and rings, the journal is the checkpoint
+	  of their running state, saved as absolute dates.
+	- A crash loses at most the changes of one debounce interval.
+	"""
+	
+	def __init__(self, path: str | None = None, debounce: float = JOURNAL_DEBOUNCE,
+				 compact_entries: int = JOURNAL_COMPACT_ENTRIES):
+		"""
+		Args:
+			- path (str): Path of the journal file, config.journal_path by default.
+			- debounce (float): Delay in seconds between a change and its writing.
+			- compact_entries (int): Number of journal entries triggering a compaction.
+		"""
+		self.path = path or config.journal_path
+		self.debounce = debounce
+		self.compact_entries = compact_entries
+		
+		self._lock = threading.RLock()
+		self._dirty = {}  # Records of the changed timers, by uid
+		self._deleted = []  # Uids of the deleted timers
+		self._flush_timer = None
+		self._closed = False
+		
+		# Number of entries in the journal file
+		self.entries = 0
+		if os.path.exists(self.path):
+			with open(self.path, "rb") as f:
+				self.entries = sum(1 for _ in f)
+		
+		# Statistics
+		self.flushes = 0
+		self.bytes_written = 0
+	##
+	
+	#
+	def mark(self, timer):
+		""" Records that a timer has changed
+			> When a tracked attribute of a timer is modified, or its running state changes
+		
+		- The record of the timer is built now, in the thread changing the timer,
+		  a later change replaces it.
+		"""
+		record = timer.to_record()
+		with self._lock:
+			self._dirty[timer.uid] = record
+			self._schedule_flush()
+	##
+	
+	#
+	def mark_deleted(self, timer):
+		""" Records that a timer has been deleted
+		"""
+		with self._lock:
+			self._dirty.pop(timer.uid, None)
+			self._deleted.append(timer.uid)
+			self._schedule_flush()
+	##
+	
+	#
+	def _schedule_flush(self):
+		""" Starts the debounce delay if no flush is pending
+		"""
+		if self._flush_timer is None and not self._closed:
+			self._flush_timer = threading.Timer(self.debounce, self._flush_pending)
+			self._flush_timer.daemon = True
+			self._flush_timer.start()
+	##
+	
+	#
+	def _flush_pending(self):
+		""" Flushes the journal at the end of the debounce delay
+		"""
+		with self._lock:
+			self._flush_timer = None
+			self.flush()
+			
+			if self.entries >= self.compact_entries:
+				self.compact()
+	##
+	
+	#
+	def flush(self):
+		""" Appends the changed and deleted timers to the journal
+		"""
+		with self._lock:
+			if not self._dirty and not self._deleted:
+				return
+			
+			lines = [json.dumps({"uid": uid, "deleted": True}, separators=(",", ":")) for uid in self._deleted]
+			lines += [json.dumps(record, separators=(",", ":")) for record in self._dirty.values()]
+			data = "\n".join(lines) + "\n"
+			
+			os.makedirs(os.path.dirname(self.path), exist_ok=True)
+			with open(self.path, "a") as f:
+				f.write(data)
+				f.flush()
+				os.fsync(f.fileno())
+			
+			self._dirty.clear()
+			self._deleted.clear()
+			self.entries += len(lines)
+			self.flushes += 1
+			self.bytes_written += len(data)
+	##
+	
+	#
+	def compact(self):
+		""" Applies the journal to the timer storage, then empties it
+		"""
+		from app.timer.storage import get_storage
+		
+		with self._lock:
+			self.flush()
+			get_storage().apply(read_journal(self.path))
+			self.clear()
+	##
+	
+	#
+	def clear(self):
+		""" Empties the journal file
+			> After a compaction or a full save of the timers
+		
+		- Pending changes are dropped, they are included in the saved timers.
+		"""
+		with self._lock:
+			self._dirty.clear()
+			self._deleted.clear()
+			if os.path.exists(self.path):
+				open(self.path, "w").close()
+			self.entries = 0
+	##
+	
+	#
+	def close(self):
+		""" Writes the pending changes and stops the debounce delay
+		"""
+		with self._lock:
+			self._closed = True
+			if self._flush_timer is not None:
+				self._flush_timer.cancel()
+				self._flush_timer = None
+			self.flush()
+	##
+##
+
+
+#
+def read_journal(path: str | None = None) -> list:
+	""" Returns the entries of the journal, in their order
+	
+	- An incomplete last line, left by a crash, is ignored.
+	
+	Args:
+		- path (str): Path of the journal file, config.journal_path by default.
+	"""
+	path = path or config.journal_path
+	if not os.path.exists(path):
+		return []
+	
+	entries = []
+	with open(path) as f:
+		for line in f:
+			try:
+				entries.append(json.loads(line))
+			except json.JSONDecodeError:
+				continue
+	
+	return entries
+##
+
+
+#
+def apply_entries(records: list, entries) -> list:
+	""" Applies journal entries to timer records
+	
+	- Changed timers replace their record, new timers are added at the end,
+	  deleted timers are removed.
+	- Entries are complete records, a running state absent from an entry is removed.
+	
+	Args:
+		- records (list): Timer records, in their order.
+		- entries (iterable): Journal entries.
+	
+	Returns:
+		- list: Updated records.
+	"""
+	# Records by uid, in their order, records without uid keep their position
+	by_uid = {record.get("uid") or f"#{index}": dict(record) for index, record in enumerate(records)}
+	
+	for entry in entries:
+		uid = entry["uid"]
+		if entry.get("deleted"):
+			by_uid.pop(uid, None)
+		else:
+			by_uid[uid] = dict(entry)
+	
+	return list(by_uid.values())
+##
+
+
+#
+def replay_journal(records: list, path: str | None = None) -> list:
+	""" Applies the journal to the records of the timer storage
+		> When loading the timers
+	
+	Args:
+		- records (list): Timer records of the storage.
+		- path (str): Path of the journal file, config.journal_path by default.
+	
+	Returns:
+		- list: Updated records.
+	"""
+	entries = read_journal(path)
+	return apply_entries(records, entries) if entries else records
+##
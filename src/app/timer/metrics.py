@@ -0,0 +1,233 @@
+
+"""
+    $ -- Firing metrics -- $
+Measures how late timer notifications are triggered and sent.
+"""
+
+import json
+import os
+import threading
+
+from app.timer import config
+
+# Number of bits of precision of the histogram buckets, about 1.6 % of relative error
+SUB_BITS = 7
+
+# Sources of lateness
+SCHEDULING = "scheduling"  # Between the notification date and the ring of the timer
+DISPATCH = "dispatch"  # Between the ring of the timer and the end of the notification sending
+
+
+class LatencyHistogram:
+	""" Histogram of durations with a constant relative precision (HDR-style)
+	
+	- Values are stored in microseconds in log-linear buckets,
+	  small values are exact and larger ones keep SUB_BITS significant bits.
+	- Memory only depends on the range of the values, not on their number.
+	"""
+	
+	def __init__(self):
+		self.counts = {}  # Number of values of each bucket
+		self.count = 0
+		self.total = 0
+		self.min = None
+		self.max = 0
+	##
+	
+	#
+	@staticmethod
+	def bucket(value: int) -> int:
+		""" Returns the bucket index of a value in microseconds
+		"""
+		if value < 1 << SUB_BITS:
+			return value
+		shift = value.bit_length() - SUB_BITS
+		return (shift << SUB_BITS) + (value >> shift)
+	
+	#
+	@staticmethod
+	def bucket_value(index: int) -> int:
+		""" Returns the middle value of a bucket, in microseconds
+		"""
+		shift = index >> SUB_BITS
+		if not shift:
+			return index
+		return ((index & ((1 << SUB_BITS) - 1)) << shift) + (1 << shift) // 2
+	##
+	
+	#
+	def record(self, value_ns: int):
+		""" Adds a duration, in nanoseconds, negative durations count as zero
+		"""
+		value = max(0, value_ns) // 1000
+		index = self.bucket(value)
+		self.counts[index] = self.counts.get(index, 0) + 1
+		
+		self.count += 1
+		self.total += value
+		self.max = max(self.max, value)
+		self.min = value if self.min is None else min(self.min, value)
+	##
+	
+	#
+	def percentile(self, percent: float) -> float:
+		""" Returns the value below which a percentage of the durations fall, in milliseconds
+		"""
+		if not self.count:
+			return 0.0
+		
+		rank = percent / 100 * self.count
+		seen = 0
+		for index in sorted(self.counts):
+			seen += self.counts[index]
+			if seen >= rank:
+				return min(self.bucket_value(index), self.max) / 1000
+		
+		return self.max / 1000
+	##
+	
+	#
+	def summary(self) -> dict:
+		""" Returns the main values of the histogram, in milliseconds
+		"""
+		return {
+			"count": self.count,
+			"p50_ms": self.percentile(50),
+			"p99_ms": self.percentile(99),
+			"max_ms": self.max / 1000,
+			"mean_ms": self.total / self.count / 1000 if self.count else 0.0,
+		}
+	##
+##
+
+
+class TickStats:
+	""" Cost of the display refresh ticks
+	
+	- Duration of each tick and number of timers it updated,
+	  a tick should cost the same whatever the number of idle timers.
+	"""
+	
+	def __init__(self):
+		self.histogram = LatencyHistogram()
+		self.timers = 0  # Timers updated by all ticks
+	##
+	
+	#
+	def record(self, duration_ns: int, timers: int):
+		""" Records a tick
+		
+		Args:
+			- duration_ns (int): Duration of the tick in nanoseconds.
+			- timers (int): Number of timers updated by the tick.
+		"""
+		self.histogram.record(duration_ns)
+		self.timers += timers
+	##
+	
+	#
+	def summary(self) -> dict:
+		""" Returns the p50, p99 and max duration of the ticks, and the mean number of updated timers
+		"""
+		summary = self.histogram.summary()
+		summary["timers_mean"] = self.timers / self.histogram.count if self.histogram.count else 0.0
+		return summary
+	##
+##
+
+
+class FiringRecorder:
+	""" Lateness of every ring, per timer and for all timers
+	
+	- Each source of lateness (scheduling, dispatch) has its own histograms.
+	- Timers are identified by their uid, titles are not unique, the summary
+	  gives the last title of each timer as a label.
+	- Can be used from the GUI thread and from the notification workers.
+	"""
+	
+	def __init__(self):
+		self._lock = threading.Lock()
+		
+		# Histograms of all timers, by source
+		self.histograms = {SCHEDULING: LatencyHistogram(), DISPATCH: LatencyHistogram()}
+		
+		# Histograms of each timer, by timer uid then by source
+		self.timers = {}
+		self.titles = {}  # Last title of each timer, by uid
+	##
+	
+	#
+	def record(self, uid: str | None, title: str, source: str, lateness_ns: int):
+		""" Records the lateness of a ring
+		
+		Args:
+			- uid (str): Uid of the timer, None for a notification without timer,
+				which is only recorded globally.
+			- title (str): Title of the timer.
+			- source (str): SCHEDULING or DISPATCH.
+			- lateness_ns (int): Lateness in nanoseconds.
+		"""
+		with self._lock:
+			self.histograms[source].record(lateness_ns)
+			if uid is None:
+				return
+			
+			histograms = self.timers.get(uid)
+			if histograms is None:
+				histograms = self.timers[uid] = {SCHEDULING: LatencyHistogram(), DISPATCH: LatencyHistogram()}
+			histograms[source].record(lateness_ns)
+			self.titles[uid] = title
+	##
+	
+	#
+	def summary(self) -> dict:
+		""" Returns the p50, p99 and max lateness of each source, globally and per timer
+		"""
+		with self._lock:
+			return {
+				"global": {source: histogram.summary() for source, histogram in self.histograms.items()},
+				"timers": {
+					uid: {"title": self.titles[uid],
+						  **{source: histogram.summary() for source, histogram in histograms.items()}}
+					for uid, histograms in self.timers.items()
+				},
+			}
+	##
+	
+	#
+	def dump(self, path: str | None = None):
+		""" Writes the summary to a JSON file
+			> When the application exits, if a ring has been recorded
+		
+		Args:
+			- path (str): Path of the file, config.FIRING_STATS_PATH at the time of writing by default.
+		"""
+		if not self.timers:
+			return
+		
+		path = path or config.FIRING_STATS_PATH
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		with open(path, "w") as f:
+			json.dump(self.summary(), f, indent=4)
+	##
+##
+
+
+# Recorder shared by the application, created on first use
+_recorder = None
+
+
+#
+def get_recorder() -> FiringRecorder:
+	""" Returns the application firing recorder
+	
+	- Its summary is written to config.FIRING_STATS_PATH when the program exits.
+	"""
+	global _recorder
+	if _recorder is None:
+		import atexit
+		
+		_recorder = FiringRecorder()
+		atexit.register(_recorder.dump)
+	return _recorder
+##
@@ -0,0 +1,375 @@
+
+"""
+    $ -- NotificationDispatcher -- $
+Sends timer notifications outside the GUI thread.
+"""
+
+import queue
+import threading
+import time
+
+from app.timer.config import NOTIFY_QUEUE_SIZE, NOTIFY_WORKERS, NOTIFY_WINDOW, NOTIFY_RATE, NOTIFY_BURST
+
+
+#
+def plyer_notify(title: str, message: str):
+	""" Sends a desktop notification with plyer
+	
+	- Can block for a long time (D-Bus, notify-send subprocess), it must not run in the GUI thread.
+	"""
+	from plyer import notification
+	
+	notification.notify(
+		title=title,
+		message=message,
+		app_name="PyTimer",
+	)
+##
+
+
+class NotificationDispatcher:
+	""" Notification queue emptied by worker threads
+	
+	- Submitting a notification never blocks, it is dropped if the queue is full.
+	- Dispatch latency, failures and queue depth are available with stats(),
+	  and each dispatch can be reported to a callback.
+	"""
+	
+	def __init__(self, backend=plyer_notify, workers: int = NOTIFY_WORKERS, maxsize: int = NOTIFY_QUEUE_SIZE,
+				 on_result=None, recorder=None):
+		"""
+		Args:
+			- backend (callable): Function sending a notification, backend(title, message).
+			- workers (int): Number of worker threads, a single one keeps the notifications in order.
+			- maxsize (int): Maximum number of notifications waiting in the queue.
+			- on_result (callable): Called by the workers after each dispatch,
+				on_result(title, message, latency_ns, error), error is None on success.
+			- recorder (FiringRecorder): Records the dispatch lateness of each timer.
+		"""
+		self.backend = backend
+		self.on_result = on_result
+		self.recorder = recorder
+		
+		self._queue = queue.Queue(maxsize)
+		self._lock = threading.Lock()
+		
+		# Statistics
+		self.submitted = 0
+		self.dispatched = 0
+		self.failed = 0
+		self.dropped = 0
+		self.last_error = None
+		self._latency_total = 0
+		self._latency_last = 0
+		self._latency_max = 0
+		
+		self._workers = []
+		for number in range(workers):
+			worker = threading.Thread(target=self._run, name=f"notifier-{number}", daemon=True)
+			worker.start()
+			self._workers.append(worker)
+	##
+	
+	#
+	def submit(self, title: str, message: str, origins: list | None = None) -> bool:
+		""" Adds a notification to the queue
+			> When a timer rings
+		
+		Args:
+			- origins (list): (timer uid, timer title, ring time in monotonic nanoseconds) of each ring
+				included in the notification, the notification itself without uid by default.
+		
+		Returns:
+			- bool: False if the queue is full and the notification has been dropped.
+		"""
+		now = time.monotonic_ns()
+		try:
+			self._queue.put_nowait((title, message, now, origins or [(None, title, now)]))
+		except queue.Full:
+			with self._lock:
+				self.dropped += 1
+			return False
+		
+		with self._lock:
+			self.submitted += 1
+		return True
+	##
+	
+	#
+	def _run(self):
+		""" Worker loop, sends the notifications of the queue
+		"""
+		while True:
+			item = self._queue.get()
+			
+			# Stop request
+			if item is None:
+				self._queue.task_done()
+				return
+			
+			title, message, submitted, origins = item
+			error = None
+			try:
+				self.backend(title, message)
+			except Exception as e:
+				error = e
+			
+			done = time.monotonic_ns()
+			latency = done - submitted
+			
+			# Dispatch lateness of each ring of the notification
+			if self.recorder is not None:
+				from app.timer.metrics import DISPATCH
+				for uid, timer, rang in origins:
+					self.recorder.record(uid, timer, DISPATCH, done - rang)
+			with self._lock:
+				if error is None:
+					self.dispatched += 1
+				else:
+					self.failed += 1
+					self.last_error = repr(error)
+				self._latency_total += latency
+				self._latency_last = latency
+				self._latency_max = max(self._latency_max, latency)
+			
+			if self.on_result:
+				try:
+					self.on_result(title, message, latency, error)
+				except Exception:
+					pass
+			
+			self._queue.task_done()
+	##
+	
+	#
+	def stats(self) -> dict:
+		""" Returns the dispatcher statistics, latencies are in milliseconds
+		"""
+		with self._lock:
+			done = self.dispatched + self.failed
+			return {
+				"submitted": self.submitted,
+				"dispatched": self.dispatched,
+				"failed": self.failed,
+				"dropped": self.dropped,
+				"queue_depth": self._queue.qsize(),
+				"latency_last_ms": self._latency_last / 1e6,
+				"latency_avg_ms": self._latency_total / done / 1e6 if done else 0.0,
+				"latency_max_ms": self._latency_max / 1e6,
+				"last_error": self.last_error,
+			}
+	##
+	
+	#
+	def join(self):
+		""" Waits until every submitted notification has been sent
+		"""
+		self._queue.join()
+	
+	#
+	def close(self):
+		""" Stops the workers after the notifications already submitted
+		"""
+		for _ in self._workers:
+			self._queue.put(None)
+		for worker in self._workers:
+			worker.join()
+		self._workers.clear()
+	##
+##
+
+
+class NotificationCoalescer:
+	""" Merges the notifications of timers ringing together and limits their rate
+	
+	- Notifications submitted within the same time window are sent as a single summary notification.
+	- A token bucket limits the number of notifications per second, while no token is available
+	  new rings keep being merged into the pending notification.
+	- Only the notifications are merged, the ring counts of the timers are not affected.
+	"""
+	
+	def __init__(self, dispatcher: NotificationDispatcher, window: float = NOTIFY_WINDOW,
+				 rate: float = NOTIFY_RATE, burst: int = NOTIFY_BURST):
+		"""
+		Args:
+			- dispatcher (NotificationDispatcher): Dispatcher sending the notifications.
+			- window (float): Merge window in seconds, starting with the first pending notification.
+			- rate (float): Tokens added per second.
+			- burst (int): Maximum number of tokens.
+		"""
+		self.dispatcher = dispatcher
+		self.window = window
+		self.rate = rate
+		self.burst = burst
+		
+		self._tokens = float(burst)
+		self._refill = time.monotonic()
+		
+		self._pending = []
+		self._flush_at = 0.0
+		self._closed = False
+		self._condition = threading.Condition()
+		
+		# Statistics
+		self.received = 0  # Notifications submitted by the timers
+		self.sent = 0  # Notifications passed to the dispatcher
+		self.merged = 0  # Notifications included in a summary instead of being sent alone
+		
+		self._worker = threading.Thread(target=self._run, name="notifier-coalescer", daemon=True)
+		self._worker.start()
+	##
+	
+	#
+	def submit(self, title: str, message: str, uid: str | None = None) -> bool:
+		""" Adds a notification to the pending notifications
+			> When a timer rings
+		
+		Args:
+			- uid (str): Uid of the ringing timer, identifies its lateness in the firing metrics.
+		"""
+		with self._condition:
+			if not self._pending:
+				self._flush_at = time.monotonic() + self.window
+			self._pending.append((title, message, time.monotonic_ns(), uid))
+			self.received += 1
+			self._condition.notify()
+		return True
+	##
+	
+	#
+	def _wait_token(self) -> float:
+		""" Takes a token from the bucket
+		
+		Returns:
+			- float: 0 if a token has been taken, otherwise the time to wait in seconds.
+		"""
+		now = time.monotonic()
+		self._tokens = min(self.burst, self._tokens + (now - self._refill) * self.rate)
+		self._refill = now
+		
+		if self._tokens >= 1:
+			self._tokens -= 1
+			return 0.0
+		
+		return (1 - self._tokens) / self.rate
+	##
+	
+	#
+	def _run(self):
+		""" Worker loop, flushes the pending notifications at the end of the window
+		"""
+		while True:
+			with self._condition:
+				# Waits for a notification
+				while not self._pending and not self._closed:
+					self._condition.wait()
+				
+				if self._closed and not self._pending:
+					return
+				
+				# Waits for the end of the window, then for a token
+				delay = self._flush_at - time.monotonic()
+				if delay <= 0:
+					delay = self._wait_token()
+				if delay > 0 and not self._closed:
+					self._condition.wait(delay)
+					continue
+				
+				pending, self._pending = self._pending, []
+			
+			self._flush(pending)
+	##
+	
+	#
+	def _flush(self, pending: list):
+		""" Sends the pending notifications, merged into a summary if there are several
+		"""
+		if len(pending) == 1:
+			title, message, _, _ = pending[0]
+		else:
+			title = f"{len(pending)} timers"
+			message = "\n".join(f"{_title} : {_message.splitlines()[0] if _message else ''}"
+								for _title, _message, _, _ in pending)
+			self.merged += len(pending)
+		
+		self.sent += 1
+		self.dispatcher.submit(title, message, [(uid, _title, rang) for _title, _, rang, uid in pending])
+	##
+	
+	#
+	def stats(self) -> dict:
+		""" Returns the coalescing statistics and the dispatcher statistics
+		"""
+		with self._condition:
+			stats = {
+				"received": self.received,
+				"sent": self.sent,
+				"merged": self.merged,
+				"pending": len(self._pending),
+			}
+		stats.update(self.dispatcher.stats())
+		return stats
+	##
+	
+	#
+	def close(self):
+		""" Sends the pending notifications and stops the worker
+		"""
+		with self._condition:
+			self._closed = True
+			self._condition.notify()
+		self._worker.join()
+	##
+##
+
+
+# Dispatcher and coalescer shared by all timers, created on first use
+_dispatcher = None
+_coalescer = None
+
+
+#
+def get_dispatcher() -> NotificationDispatcher:
+	""" Returns the application notification dispatcher
+	"""
+	global _dispatcher
+	if _dispatcher is None:
+		from app.timer.metrics import get_recorder
+		_dispatcher = NotificationDispatcher(recorder=get_recorder())
+	return _dispatcher
+##
+
+
+#
+def get_notifier() -> NotificationCoalescer:
+	""" Returns the notification entry point of the timers, coalescing in front of the dispatcher
+	
+	- The pending notifications are sent when the program exits, if close_notifier() was not called before.
+	"""
+	global _coalescer
+	if _coalescer is None:
+		import atexit
+		
+		_coalescer = NotificationCoalescer(get_dispatcher())
+		atexit.register(close_notifier)
+	return _coalescer
+##
+
+
+#
+def close_notifier():
+	""" Sends the pending and queued notifications, then stops the coalescer and dispatcher workers
+		> When the application is closed
+	
+	- Their worker threads are daemon threads, notifications left in them would be lost at exit.
+	- They are created again by the next call to get_notifier().
+	"""
+	global _coalescer, _dispatcher
+	
+	if _coalescer is not None:
+		_coalescer.close()
+		_coalescer = None
+	if _dispatcher is not None:
+		_dispatcher.close()
+		_dispatcher = None
+##
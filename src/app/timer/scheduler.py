@@ -0,0 +1,156 @@
+
+"""
+    $ -- TimerScheduler -- $
+Deadline-driven scheduling of running timers.
+"""
+
+import heapq
+import itertools
+import time
+
+from app.timer.config import SCHEDULER_BACKEND
+
+
+class TimerScheduler:
+	""" Priority queue of the next deadlines of running timers
+
+	- Each running timer has at most one entry, keyed on its next notification date.
+	- The earliest deadline is used to arm a single-shot QTimer,
+	  so the application only wakes up when a timer has something to do.
+	- Deadlines are expressed in nanoseconds of the monotonic clock (time.monotonic_ns).
+	"""
+
+	def __init__(self):
+		# Heap of [deadline, order, timer] entries
+		self._heap = []
+
+		# Entry of each scheduled timer, to cancel it without searching the heap
+		self._entries = {}
+
+		# Insertion counter, keeps the order of timers with the same deadline
+		self._counter = itertools.count()
+	##
+
+	def __len__(self):
+		""" Number of scheduled timers
+		"""
+		return len(self._entries)
+
+	def __contains__(self, timer):
+		""" Checks whether a timer is scheduled
+		"""
+		return id(timer) in self._entries
+
+	#
+	def schedule(self, timer) -> bool:
+		""" Schedules the next deadline of a timer
+			> When a timer is started, stopped, reset or has rung
+
+		- Replaces the previous deadline of the timer if any.
+		- Timers without a next deadline (stopped or finished) are simply removed.
+
+		Args:
+			- timer (Timer): Timer to schedule.
+
+		Returns:
+			- bool: True if the timer has been scheduled.
+		"""
+		self.cancel(timer)
+
+		deadline = timer.next_deadline
+		if deadline is None:
+			return False
+
+		entry = [deadline, next(self._counter), timer]
+		self._entries[id(timer)] = entry
+		heapq.heappush(self._heap, entry)
+		return True
+	##
+
+	#
+	def cancel(self, timer):
+		""" Removes a timer from the scheduler
+
+		- The heap entry is only marked as removed, it is discarded when it reaches the top.
+		"""
+		entry = self._entries.pop(id(timer), None)
+		if entry is not None:
+			entry[-1] = None
+	##
+
+	#
+	def next_deadline(self) -> int | None:
+		""" Returns the earliest deadline in monotonic nanoseconds, None if nothing is scheduled
+		"""
+		heap = self._heap
+
+		# Discards removed entries at the top of the heap
+		while heap and heap[0][-1] is None:
+			heapq.heappop(heap)
+
+		return heap[0][0] if heap else None
+	##
+
+	#
+	def timeout(self, now: int | None = None) -> int | None:
+		""" Returns the delay in milliseconds before the earliest deadline
+
+		- Rounded up so that a single-shot timer never fires before the deadline.
+		- None if nothing is scheduled.
+		"""
+		deadline = self.next_deadline()
+		if deadline is None:
+			return None
+
+		if now is None:
+			now = time.monotonic_ns()
+
+		return max(0, -((now - deadline) // 1_000_000))
+	##
+
+	#
+	def pop_due(self, now: int | None = None) -> list:
+		""" Removes and returns the timers whose deadline has passed
+			> When the single-shot QTimer fires
+
+		- Due timers are no longer scheduled, they must be rescheduled after being updated.
+		"""
+		if now is None:
+			now = time.monotonic_ns()
+
+		heap = self._heap
+		due = []
+
+		while heap and (heap[0][-1] is None or heap[0][0] <= now):
+			*_, timer = heapq.heappop(heap)
+			if timer is None:
+				continue
+
+			del self._entries[id(timer)]
+			due.append(timer)
+
+		return due
+	##
+
+	#
+	def clear(self):
+		""" Removes all scheduled timers
+		"""
+		self._heap.clear()
+		self._entries.clear()
+	##
+##
+
+
+#
+def create_scheduler(backend: str = SCHEDULER_BACKEND):
+	""" Creates the scheduler of running timers
+	
+	Args:
+		- backend (str): "heap" for a TimerScheduler, "wheel" for a TimingWheel.
+	"""
+	if backend == "wheel":
+		from app.timer.wheel import TimingWheel
+		return TimingWheel()
+	
+	return TimerScheduler()
@@ -0,0 +1,188 @@
+
+"""
+    $ -- Timer snapshot -- $
+Compact binary file of the timers, read through a memory map.
+"""
+
+import mmap
+import os
+import struct
+
+# File identifier and format version, the version changes with the record layout
+MAGIC = b"PTMS"
+VERSION = 2
+
+# Header : magic, version, record size, number of records
+HEADER = struct.Struct("<4sHHI")
+
+# Fixed-width record of a timer :
+# uid (16 raw bytes), title and message (offset in the string table, length in bytes),
+# timer, number of rings, interval, running state (0 when not running) :
+# next deadline, end time, rings left
+RECORD = struct.Struct("<16sIHIHIBHqqB")
+
+# Running state of the records, in order, after the interval
+STATE = ("deadline", "end_time", "rings_left")
+
+
+class Snapshot:
+	""" Read-only view of a snapshot file
+	
+	- The file is mapped in memory, opening it only reads the header.
+	- Each record is decoded when it is accessed, titles and messages are read
+	  from the string table which follows the records.
+	
+	File layout :
+		header (12 bytes) | records (RECORD.size bytes each) | string table (UTF-8)
+	"""
+	
+	def __init__(self, path: str):
+		with open(path, "rb") as f:
+			self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		
+		magic, version, record_size, self._count = HEADER.unpack_from(self._map, 0)
+		if magic != MAGIC:
+			self.close()
+			raise ValueError(f"{path} is not a timer snapshot")
+		if version != VERSION or record_size != RECORD.size:
+			self.close()
+			raise ValueError(f"Unsupported timer snapshot version {version}")
+		
+		# Start of the string table
+		self._strings = HEADER.size + self._count * RECORD.size
+	##
+	
+	def __len__(self):
+		return self._count
+	
+	def __getitem__(self, index: int) -> dict:
+		""" Decodes a record
+		"""
+		if not -self._count <= index < self._count:
+			raise IndexError("snapshot index out of range")
+		return self._decode(index % self._count)
+	
+	def __iter__(self):
+		""" Decodes all records in order
+		
+		- The records are unpacked in bulk and the strings shared by several timers are decoded once.
+		"""
+		strings = self._map[self._strings:]
+		decoded = {}  # Strings already decoded, by offset
+		
+		def string(offset: int, length: int) -> str:
+			text = decoded.get(offset)
+			if text is None:
+				text = decoded[offset] = strings[offset:offset + length].decode()
+			return text
+		
+		for (uid, title_offset, title_length, message_offset, message_length,
+			 timer, number_rings, interval, *state) in RECORD.iter_unpack(self._map[HEADER.size:self._strings]):
+			record = {
+				"uid": uid.hex(),
+				"title": string(title_offset, title_length),
+				"message": string(message_offset, message_length),
+				"timer": timer,
+				"number_rings": number_rings,
+				"interval": interval,
+			}
+			add_state(record, state)
+			yield record
+	
+	def __enter__(self):
+		return self
+	
+	def __exit__(self, *args):
+		self.close()
+	
+	#
+	def _decode(self, index: int) -> dict:
+		""" Returns the record of a timer, in the format of Timer.to_record()
+		"""
+		(uid, title_offset, title_length, message_offset, message_length,
+		 timer, number_rings, interval, *state) = RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+		
+		strings = self._strings
+		record = {
+			"uid": uid.hex(),
+			"title": self._map[strings + title_offset:strings + title_offset + title_length].decode(),
+			"message": self._map[strings + message_offset:strings + message_offset + message_length].decode(),
+			"timer": timer,
+			"number_rings": number_rings,
+			"interval": interval,
+		}
+		add_state(record, state)
+		
+		return record
+	##
+	
+	#
+	def close(self):
+		""" Releases the memory map, records can no longer be read
+		"""
+		self._map.close()
+	##
+##
+
+
+#
+def add_state(record: dict, state: tuple):
+	""" Adds the running state of a decoded record, in the format of Timer.running_state()
+	
+	- The end time is 0 for a timer that is not running.
+	- The deadline is 0 for a timer whose rings are over.
+	"""
+	if not state[1]:
+		return
+	
+	deadline, end_time, rings_left = state
+	record["end_time"] = end_time
+	record["rings_left"] = rings_left
+	if deadline:
+		record["deadline"] = deadline
+##
+
+
+#
+def encode_snapshot(records: list) -> bytes:
+	""" Encodes timer records in the snapshot format
+	
+	- Identical titles and messages are stored once in the string table.
+	"""
+	strings = bytearray()
+	offsets = {}  # Position of each string in the string table
+	
+	def add_string(text: str) -> tuple:
+		data = text.encode()
+		offset = offsets.get(data)
+		if offset is None:
+			offset = offsets[data] = len(strings)
+			strings.extend(data)
+		return offset, len(data)
+	
+	parts = [HEADER.pack(MAGIC, VERSION, RECORD.size, len(records))]
+	for record in records:
+		title = add_string(record["title"])
+		message = add_string(record["message"])
+		parts.append(RECORD.pack(
+			bytes.fromhex(record["uid"]), *title, *message,
+			record["timer"], record.get("number_rings", 0), record.get("interval", 0),
+			*(record.get(key) or 0 for key in STATE),
+		))
+	parts.append(strings)
+	
+	return b"".join(parts)
+##
+
+
+#
+def write_snapshot(path: str, records: list):
+	""" Writes a snapshot file in a single atomic operation
+	
+	- Same guarantees as utils.write_bytes_atomic, the file is either the previous one or the new one.
+	"""
+	from utils import write_bytes_atomic
+	
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	write_bytes_atomic(path, encode_snapshot(records))
+##
@@ -0,0 +1,345 @@
+
+"""
+    $ -- TimerStorage -- $
+Storage backends of the timers, TinyDB JSON file, SQLite database or binary snapshot.
+"""
+
+import os
+import threading
+
+from app.timer import config
+from app.timer.config import STORAGE_BACKEND
+
+# Columns of the timer table, in the order of the statements below
+COLUMNS = ("uid", "title", "message", "timer", "number_rings", "interval", "deadline", "end_time", "rings_left")
+
+# Columns of the running state, NULL for timers that are not running
+STATE_COLUMNS = {"deadline": "INTEGER", "end_time": "INTEGER", "rings_left": "INTEGER"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS timers (
+	uid TEXT PRIMARY KEY,
+	position INTEGER NOT NULL,
+	title TEXT NOT NULL,
+	message TEXT NOT NULL,
+	timer INTEGER NOT NULL,
+	number_rings INTEGER NOT NULL,
+	interval INTEGER NOT NULL,
+	deadline INTEGER,
+	end_time INTEGER,
+	rings_left INTEGER
+);
+CREATE INDEX IF NOT EXISTS timers_position ON timers (position);
+CREATE INDEX IF NOT EXISTS timers_title ON timers (title);
+CREATE INDEX IF NOT EXISTS timers_deadline ON timers (deadline) WHERE deadline IS NOT NULL;
+"""
+
+# Statements are constant strings, sqlite3 prepares them once and keeps them in its cache
+SELECT_TIMERS = ("SELECT uid, title, message, timer, number_rings, interval, deadline, end_time, rings_left "
+				 "FROM timers ORDER BY position")
+INSERT_TIMER = ("INSERT INTO timers (position, uid, title, message, timer, number_rings, interval, "
+				"deadline, end_time, rings_left) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+UPSERT_TIMER = (INSERT_TIMER + " ON CONFLICT (uid) DO UPDATE SET title = excluded.title, message = excluded.message, "
+				"timer = excluded.timer, number_rings = excluded.number_rings, interval = excluded.interval, "
+				"deadline = excluded.deadline, end_time = excluded.end_time, rings_left = excluded.rings_left")
+DELETE_TIMER = "DELETE FROM timers WHERE uid = ?"
+NEXT_POSITION = "SELECT COALESCE(MAX(position) + 1, 0) FROM timers"
+
+
+class TimerStorage:
+	""" Interface of the timer storage backends
+	
+	- Timers are exchanged as records, the dictionaries returned by Timer.to_record(),
+	  in the order of the timer list.
+	- apply() writes journal entries, backends without partial writes rewrite all records.
+	"""
+	
+	path = None  # File of the backend
+	
+	#
+	def load(self) -> list:
+		""" Returns the records of all timers
+		"""
+		raise NotImplementedError
+	##
+	
+	#
+	def save(self, records: list):
+		""" Replaces all timers with the records
+		"""
+		raise NotImplementedError
+	##
+	
+	#
+	def apply(self, entries):
+		""" Writes journal entries, changed records and deletions {"uid": ..., "deleted": True}
+			> When the journal is compacted
+		"""
+		from app.timer.journal import apply_entries
+		self.save(apply_entries(self.load(), entries))
+	##
+	
+	#
+	def migrate(self) -> int:
+		""" Imports the timers of the TinyDB JSON file
+			> When the SQLite database or the snapshot is opened for the first time
+		
+		- Timers without uid get one.
+		- The JSON file is renamed with a .migrated suffix, the migration only runs once.
+		
+		Returns:
+			- int: Number of imported timers.
+		"""
+		if not os.path.exists(config.db_path):
+			return 0
+		
+		tinydb = TinyDBStorage()
+		records = [dict(record) for record in tinydb.load()]
+		tinydb.close()
+		
+		for record in records:
+			record.setdefault("uid", os.urandom(16).hex())
+		
+		self.save(records)
+		os.replace(config.db_path, config.db_path + ".migrated")
+		return len(records)
+	##
+	
+	#
+	def close(self):
+		""" Releases the files of the backend
+		"""
+	##
+##
+
+
+class TinyDBStorage(TimerStorage):
+	""" Timers stored in the TinyDB JSON file
+	
+	- Reading parses the whole file, writing replaces the whole file.
+	"""
+	
+	@property
+	def path(self):
+		return config.db_path
+	
+	#
+	def load(self) -> list:
+		""" Returns the records of the TinyDB table
+		"""
+		return config.get_db_timer().all()
+	##
+	
+	#
+	def save(self, records: list):
+		""" Replaces the database file in a single write, in the TinyDB table format
+		"""
+		from app.timer.utils import write_json_atomic
+		
+		# Table of the timers, indexed by document id like TinyDB
+		table = {str(doc_id): record for doc_id, record in enumerate(records, start=1)}
+		
+		# The database file is released before being replaced
+		config.close_db_timer()
+		write_json_atomic(config.db_path, {"_default": table})
+	##
+	
+	#
+	def close(self):
+		config.close_db_timer()
+	##
+##
+
+
+class SQLiteStorage(TimerStorage):
+	""" Timers stored in a SQLite database
+	
+	- WAL journal mode, readers do not block the writer and writes only append to the WAL file.
+	- Journal entries are applied as upserts and deletions, without rewriting the other timers.
+	- Indexes on the title and on the next deadline.
+	- The connection is shared with the journal thread and protected by a lock.
+	"""
+	
+	def __init__(self, path: str | None = None):
+		import sqlite3
+		
+		self.path = path or config.sqlite_path
+		os.makedirs(os.path.dirname(self.path), exist_ok=True)
+		
+		self._lock = threading.Lock()
+		self._connection = sqlite3.connect(self.path, check_same_thread=False)
+		self._connection.execute("PRAGMA journal_mode = WAL")
+		self._connection.execute("PRAGMA synchronous = NORMAL")
+		self._connection.executescript(SCHEMA)
+		
+		# Databases created before the running state was saved
+		existing = {row[1] for row in self._connection.execute("PRAGMA table_info(timers)")}
+		for column, kind in STATE_COLUMNS.items():
+			if column not in existing:
+				self._connection.execute(f"ALTER TABLE timers ADD COLUMN {column} {kind}")
+		self._connection.commit()
+	##
+	
+	#
+	@staticmethod
+	def _row(position: int, record: dict) -> tuple:
+		""" Returns the parameters of the insert statement of a record
+		"""
+		return (position, record["uid"], record["title"], record["message"], record["timer"],
+				record.get("number_rings", 0), record.get("interval", 0),
+				record.get("deadline"), record.get("end_time"), record.get("rings_left"))
+	##
+	
+	#
+	def load(self) -> list:
+		""" Returns the records of the timer table, in the order of the list
+		"""
+		with self._lock:
+			rows = self._connection.execute(SELECT_TIMERS).fetchall()
+		
+		records = []
+		for row in rows:
+			record = dict(zip(COLUMNS, row))
+			
+			# The running state is only stored for running timers
+			for column in STATE_COLUMNS:
+				if record[column] is None:
+					del record[column]
+			records.append(record)
+		
+		return records
+	##
+	
+	#
+	def save(self, records: list):
+		""" Replaces all timers in a single transaction
+		"""
+		with self._lock, self._connection:
+			self._connection.execute("DELETE FROM timers")
+			self._connection.executemany(INSERT_TIMER, [self._row(position, record)
+														for position, record in enumerate(records)])
+	##
+	
+	#
+	def apply(self, entries):
+		""" Upserts the changed records and deletes the deleted ones in a single transaction
+		
+		- New timers are placed at the end of the list.
+		"""
+		with self._lock, self._connection:
+			position = self._connection.execute(NEXT_POSITION).fetchone()[0]
+			
+			for entry in entries:
+				if entry.get("deleted"):
+					self._connection.execute(DELETE_TIMER, (entry["uid"],))
+				else:
+					self._connection.execute(UPSERT_TIMER, self._row(position, entry))
+					position += 1
+	##
+	
+	#
+	def close(self):
+		with self._lock:
+			self._connection.close()
+	##
+##
+
+
+class SnapshotStorage(TimerStorage):
+	""" Timers stored in a binary snapshot, see app.timer.snapshot
+	
+	- Loading decodes the fixed-width records of the memory-mapped file, without parsing.
+	- Writing replaces the whole file, like TinyDB, but with a file several times smaller.
+	"""
+	
+	@property
+	def path(self):
+		return config.snapshot_path
+	
+	#
+	def load(self) -> list:
+		""" Returns the records of the snapshot
+		"""
+		from app.timer.snapshot import Snapshot
+		
+		if not os.path.exists(self.path):
+			return []
+		
+		with Snapshot(self.path) as snapshot:
+			return list(snapshot)
+	##
+	
+	#
+	def save(self, records: list):
+		""" Replaces the snapshot file in a single write
+		"""
+		from app.timer.snapshot import write_snapshot
+		write_snapshot(self.path, records)
+	##
+##
+
+
+# Storage backends, by name
+BACKENDS = {
+	"tinydb": TinyDBStorage,
+	"sqlite": SQLiteStorage,
+	"snapshot": SnapshotStorage,
+}
+
+# Storage shared by the application, opened on first use
+_storage = None
+
+
+#
+def get_storage(backend: str = STORAGE_BACKEND) -> TimerStorage:
+	""" Returns the application timer storage
+	
+	- Opening the SQLite or snapshot backend while its file does not exist yet
+	  migrates the TinyDB JSON file.
+	
+	Args:
+		- backend (str): "tinydb", "sqlite" or "snapshot".
+	"""
+	global _storage
+	
+	if _storage is None:
+		# Files of the backends replacing the TinyDB JSON file
+		paths = {"sqlite": config.sqlite_path, "snapshot": config.snapshot_path}
+		new = backend in paths and not os.path.exists(paths[backend])
+		
+		_storage = BACKENDS[backend]()
+		if new:
+			_storage.migrate()
+	
+	return _storage
+##
+
+
+#
+def close_storage():
+	""" Closes the application timer storage, it is opened again by the next call to get_storage()
+	"""
+	global _storage
+	
+	if _storage is not None:
+		_storage.close()
+		_storage = None
+##
+
+
+#
+def export_json(path: str, records: list | None = None):
+	""" Writes the timers to a JSON file in the TinyDB format
+		> To read the timers or to move them to the "tinydb" backend, whatever the storage backend
+	
+	Args:
+		- path (str): Path of the JSON file.
+		- records (list): Timer records, those of the application storage by default.
+	"""
+	from app.timer.utils import write_json_atomic
+	
+	if records is None:
+		records = get_storage().load()
+	
+	write_json_atomic(path, {"_default": {str(doc_id): dict(record) for doc_id, record in enumerate(records, start=1)}})
+##
@@ -0,0 +1,385 @@
+
+"""
+    $ -- TimerStore -- $
+Compact storage of a large number of timers.
+"""
+
+import time
+from array import array
+from typing import NamedTuple
+
+from app.timer.config import MAX_CHAR_NAME, MAX_CHAR_MESSAGE
+
+# Timer status bits stored in the flags column
+RUNNING = 1
+REMAINING = 2
+END = 4
+
+
+class Tick(NamedTuple):
+	""" Result of a batch update of the timers
+	"""
+	timeleft: object  # Remaining time of every timer in nanoseconds (numpy int64 array)
+	due: object  # Indices of the timers that have rung (numpy array)
+	late: object  # For each index of due, True if it is not the first ring of the timer
+##
+
+
+class TimerStore:
+	""" Struct-of-arrays storage of timers
+	
+	- Each timer attribute is a column, numeric columns are typed arrays,
+	  a timer is the row at the same index in every column.
+	- Dates use the monotonic clock, in nanoseconds, like Timer in monotonic mode.
+	- Rows are accessed through TimerRow views, which only hold the store and the index.
+	
+	Memory per timer :
+		- 33 bytes of numeric columns :
+			timer (4) + timeleft (8) + end date (8) + notification date (8)
+			+ rings (1) + remaining rings (1) + interval (2) + flags (1)
+		- 16 bytes of references to the title and message strings,
+		  identical strings can be shared between timers.
+		That is 49 bytes plus the strings, about 110 bytes per timer with short distinct titles,
+		against about 300 bytes for Timer instances (see python -m benchmarks.bench_store).
+	"""
+	
+	def __init__(self):
+		self.titles = []  # Timer titles
+		self.messages = []  # Notification messages
+		
+		self.timer = array("I")  # Default time in seconds
+		self.timeleft = array("q")  # Remaining time in nanoseconds when stopped
+		self.end_ns = array("q")  # End date in monotonic nanoseconds
+		self.notif_ns = array("q")  # Next notification date in monotonic nanoseconds
+		self.number_rings = array("B")  # Number of rings
+		self.rings_left = array("B")  # Number of remaining rings
+		self.interval = array("H")  # Time between rings in seconds
+		self.flags = array("B")  # Timer status (RUNNING, REMAINING, END)
+	##
+	
+	def __len__(self):
+		return len(self.titles)
+	
+	def __getitem__(self, index: int):
+		""" Returns the view of a row
+		"""
+		if not -len(self) <= index < len(self):
+			raise IndexError("timer index out of range")
+		return TimerRow(self, index % len(self))
+	
+	def __iter__(self):
+		for index in range(len(self)):
+			yield TimerRow(self, index)
+	
+	#
+	@property
+	def nbytes(self) -> int:
+		""" Memory used by the numeric columns and the string references, without the strings
+		"""
+		columns = (self.timer, self.timeleft, self.end_ns, self.notif_ns,
+				   self.number_rings, self.rings_left, self.interval, self.flags)
+		return sum(column.itemsize * len(column) for column in columns) + 16 * len(self)
+	##
+	
+	#
+	def append(self, title: str, message: str, timer: int, number_rings: int = 0, interval: int = 0):
+		""" Adds a timer to the store
+		
+		- Same checks as the Timer class for the title and message.
+		
+		Returns:
+			- TimerRow: View of the new row.
+		"""
+		
+		# Title and message check
+		if not 0 < len(title) < MAX_CHAR_NAME + 1:
+			raise AttributeError(f"The number of characters in nom must not exceed {MAX_CHAR_NAME}.")
+		if not len(message) < MAX_CHAR_MESSAGE + 1:
+			raise AttributeError(f"The number of characters in message must not exceed {MAX_CHAR_MESSAGE}.")
+		
+		self.titles.append(title)
+		self.messages.append(message)
+		self.timer.append(timer)
+		self.timeleft.append(timer * 1_000_000_000)
+		self.end_ns.append(0)
+		self.notif_ns.append(0)
+		self.number_rings.append(number_rings)
+		self.rings_left.append(number_rings)
+		self.interval.append(interval)
+		self.flags.append(0)
+		
+		return TimerRow(self, len(self) - 1)
+	##
+	
+	#
+	def add_timer(self, timer):
+		""" Adds a Timer instance to the store, in its default state
+		"""
+		return self.append(timer.title, timer.message, timer.timer, timer.number_rings, timer.interval)
+	
+	#
+	@classmethod
+	def from_timers(cls, timers):
+		""" Creates a store from a list of timers
+		"""
+		store = cls()
+		for timer in timers:
+			store.add_timer(timer)
+		return store
+	##
+	
+	#
+	def remove(self, index: int):
+		""" Deletes a timer from the store
+		
+		- The following rows are shifted, the views on them must be recreated.
+		"""
+		for column in (self.titles, self.messages, self.timer, self.timeleft, self.end_ns, self.notif_ns,
+					   self.number_rings, self.rings_left, self.interval, self.flags):
+			del column[index]
+	##
+	
+	#
+	def start(self, index: int, now: int | None = None):
+		""" Starts a timer, or stops it if it is already running
+			> Same behaviour as Timer.start_timer
+		"""
+		flags = self.flags[index]
+		if flags & END:
+			return
+		
+		if flags & RUNNING:
+			self.stop(index, now)
+			return
+		
+		if now is None:
+			now = time.monotonic_ns()
+		
+		# Set end date
+		self.end_ns[index] = now + self.timeleft[index]
+		self.notif_ns[index] = self.end_ns[index]
+		self.flags[index] = flags | RUNNING
+	##
+	
+	#
+	def stop(self, index: int, now: int | None = None):
+		""" Stops a timer and keeps its remaining time
+			> Same behaviour as Timer.stop_timer
+		"""
+		flags = self.flags[index]
+		if not flags & RUNNING:
+			return
+		
+		if now is None:
+			now = time.monotonic_ns()
+		
+		self.timeleft[index] = self.end_ns[index] - now
+		self.flags[index] = flags & ~RUNNING
+	##
+	
+	#
+	def reset(self, index: int):
+		""" Resets a timer to its default duration
+			> Same behaviour as Timer.reset
+		"""
+		self.timeleft[index] = self.timer[index] * 1_000_000_000
+		self.end_ns[index] = 0
+		self.notif_ns[index] = 0
+		self.rings_left[index] = self.number_rings[index]
+		self.flags[index] = 0
+	##
+	
+	#
+	def tick(self, now: int | None = None) -> Tick:
+		""" Updates all timers at once
+			> Replaces a call to Timer.set_timeleft for each timer
+		
+		- The current time is taken once, remaining times are computed in one numpy operation.
+		- The timers whose notification date has passed are found in the same pass,
+		  the ring bookkeeping is then only done for them.
+		- Notifications are not sent, see notifications().
+		
+		Args:
+			- now (int): Current time in monotonic nanoseconds, taken from the clock if not supplied.
+		
+		Returns:
+			- Tick: Remaining times and timers that have rung.
+		"""
+		import numpy as np
+		
+		if now is None:
+			now = time.monotonic_ns()
+		
+		# Views on the columns, released at the end of the tick so that the arrays can still grow
+		flags = np.frombuffer(self.flags, dtype=np.uint8)
+		end_ns = np.frombuffer(self.end_ns, dtype=np.int64)
+		notif_ns = np.frombuffer(self.notif_ns, dtype=np.int64)
+		
+		running = (flags & RUNNING).astype(bool)
+		timeleft = np.where(running, end_ns - now, np.frombuffer(self.timeleft, dtype=np.int64))
+		
+		# Running timers that have not ended and whose notification date has passed
+		due = np.flatnonzero(running & (flags & END == 0) & (notif_ns < now))
+		if not due.size:
+			return Tick(timeleft, due, np.zeros(0, dtype=bool))
+		
+		number_rings = np.frombuffer(self.number_rings, dtype=np.uint8)
+		rings_left = np.frombuffer(self.rings_left, dtype=np.uint8)
+		interval = np.frombuffer(self.interval, dtype=np.uint16)
+		
+		left = rings_left[due]
+		late = left != number_rings[due]
+		
+		flags[due] |= REMAINING
+		
+		# Timers with additional rings, the next notification is postponed
+		ringing = due[left > 0]
+		notif_ns[ringing] += interval[ringing].astype(np.int64) * 1_000_000_000
+		rings_left[ringing] -= 1
+		
+		# Last ring
+		flags[due[left == 0]] |= END
+		
+		return Tick(timeleft, due, late)
+	##
+	
+	#
+	def notifications(self, tick: Tick, now: int | None = None) -> list:
+		""" Builds the notifications of the timers that have rung during a tick
+		
+		- Same messages as Timer.ring, the time elapsed since the end date
+		  is added after the first ring.
+		
+		Returns:
+			- list: (title, message) tuples.
+		"""
+		from app.timer.duration import format_duration
+		
+		if now is None:
+			now = time.monotonic_ns()
+		
+		notifications = []
+		for index, late in zip(tick.due.tolist(), tick.late.tolist()):
+			message = self.messages[index]
+			if late:
+				seconds = format_duration((now - self.end_ns[index]) // 1_000_000_000)
+				message += f"\n - {seconds} !"
+			notifications.append((self.titles[index], message))
+		
+		return notifications
+	##
+	
+	#
+	def to_dict(self, index: int) -> dict:
+		""" Returns the user-defined attributes of a timer
+		
+		- Accepted by the Timer class, Timer(**store.to_dict(index)).
+		"""
+		return {
+			"title": self.titles[index],
+			"message": self.messages[index],
+			"timer": self.timer[index],
+			"number_rings": self.number_rings[index],
+			"interval": self.interval[index],
+		}
+	##
+	
+	#
+	def to_timer(self, index: int):
+		""" Creates a Timer instance from a row, in its default state
+		"""
+		from app.timer.timer import Timer
+		return Timer(**self.to_dict(index))
+	##
+##
+
+
+#
+class TimerRow:
+	""" View on a row of a TimerStore
+	
+	- Reads and writes the store columns, it holds no timer data itself.
+	- Becomes invalid if a previous row is removed from the store.
+	"""
+	
+	__slots__ = ("store", "index")
+	
+	def __init__(self, store: TimerStore, index: int):
+		self.store = store
+		self.index = index
+	
+	def __repr__(self):
+		return f"TimerRow(index={self.index}, title={self.title!r})"
+	
+	@property
+	def title(self):
+		return self.store.titles[self.index]
+	
+	@title.setter
+	def title(self, value):
+		self.store.titles[self.index] = value
+	
+	@property
+	def message(self):
+		return self.store.messages[self.index]
+	
+	@message.setter
+	def message(self, value):
+		self.store.messages[self.index] = value
+	
+	@property
+	def timer(self):
+		return self.store.timer[self.index]
+	
+	@timer.setter
+	def timer(self, value):
+		self.store.timer[self.index] = value
+	
+	@property
+	def number_rings(self):
+		return self.store.number_rings[self.index]
+	
+	@number_rings.setter
+	def number_rings(self, value):
+		self.store.number_rings[self.index] = value
+	
+	@property
+	def interval(self):
+		return self.store.interval[self.index]
+	
+	@interval.setter
+	def interval(self, value):
+		self.store.interval[self.index] = value
+	
+	@property
+	def running(self):
+		return bool(self.store.flags[self.index] & RUNNING)
+	
+	@property
+	def remaining(self):
+		return bool(self.store.flags[self.index] & REMAINING)
+	
+	@property
+	def end(self):
+		return bool(self.store.flags[self.index] & END)
+	
+	@property
+	def timeleft_ns(self):
+		""" Remaining time in nanoseconds
+		"""
+		if self.running:
+			return self.store.end_ns[self.index] - time.monotonic_ns()
+		return self.store.timeleft[self.index]
+	
+	def start(self, now: int | None = None):
+		self.store.start(self.index, now)
+	
+	def stop(self, now: int | None = None):
+		self.store.stop(self.index, now)
+	
+	def reset(self):
+		self.store.reset(self.index)
+	
+	def to_dict(self):
+		return self.store.to_dict(self.index)
+##
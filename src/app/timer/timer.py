@@ -4,14 +4,16 @@
 Class representing a timer.
 """
 
-from dataclasses import dataclass
+import math
+import os
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import ClassVar, Optional
 
-from plyer import notification
-
-from app.timer.utils import new_date
-from app.timer.config import MAX_CHAR_NAME, MAX_CHAR_MESSAGE
+from app.timer.duration import format_duration
+from app.timer.utils import new_date, duration_ns
+from app.timer.config import MAX_CHAR_NAME, MAX_CHAR_MESSAGE, TIMER_CLOCK
 
 
 @dataclass
@@ -27,7 +29,7 @@ class Timer:
 	#
 	# Other attributes
 	
-	_timeleft: int | timedelta = 0  # Remaining time in seconds and microseconds
+	_timeleft: int | float | timedelta = 0  # Remaining time in seconds and microseconds
 	
 	number_rings: int = 0  # Number of rings
 	_number_rings: int = 0  # Number of remaining rings
@@ -41,12 +43,35 @@ class Timer:
 	# Date used for the next notification after the timer has passed its end date.
 	notif_date: Optional[datetime] = None
 	
+	# End and notification dates in monotonic nanoseconds (monotonic clock)
+	_end_ns: Optional[int] = None
+	_notif_ns: Optional[int] = None
+	
 	# Étimer status
 	running: bool = False
 	remaining: bool = False
 	# Checks whether the timer has ended
 	end: bool = False
 	
+	# Identifier of the timer in the database and the journal, 128 random bits like uuid4
+	uid: str = field(default_factory=lambda: os.urandom(16).hex())
+	
+	# Clock used to compute dates, "monotonic" or "wall"
+	clock: ClassVar[str] = TIMER_CLOCK
+	
+	# Attributes saved in the database, changes of the user-defined ones are reported to the journal
+	persisted: ClassVar[tuple] = ("uid", "title", "message", "timer", "number_rings", "interval")
+	tracked: ClassVar[tuple] = ("title", "message", "timer", "number_rings", "interval")
+	
+	# Running state saved with running timers, dates in wall-clock nanoseconds since the epoch
+	state: ClassVar[tuple] = ("end_time", "deadline", "rings_left")
+	
+	# Write-behind journal of the timer changes, None when changes are not tracked
+	journal: ClassVar = None
+	
+	# Displays the remaining time to the hundredth of a second, in whole seconds otherwise
+	centiseconds: ClassVar[bool] = True
+	
 	#
 	def __post_init__(self):
 		""" Initialization """
@@ -90,14 +115,55 @@ class Timer:
 	@property
 	def timeleft(self):
 		""" Remaining time attribute
+		
+		- Rounded up to whole seconds when the hundredths are not displayed.
+		"""
+		if self.centiseconds:
+			return format_duration(self._timeleft)
+		return format_duration(self.timeleft_bucket)
+	
+	@property
+	def timeleft_bucket(self) -> int:
+		""" Remaining time at the precision of its display, in hundredths of a second or in whole seconds
+		
+		- Changes when the displayed remaining time changes, without formatting it.
 		"""
-		return format_duration(self._timeleft)
+		timeleft = self._timeleft
+		if isinstance(timeleft, timedelta):
+			timeleft = timeleft.total_seconds()
+		if self.centiseconds:
+			return round(timeleft * 100)
+		return math.ceil(timeleft)
 	
 	@property
 	def end_date(self):
 		""" End date attribute
 		"""
+		# Conversion to wall-clock time only when the monotonic end date is displayed
+		if self._end_ns is not None:
+			return new_date((self._end_ns - time.monotonic_ns()) / 1e9).strftime("%H:%M:%S")
+		
 		return self._end_date.strftime("%H:%M:%S") if self._end_date else "---"
+	
+	@property
+	def next_deadline(self):
+		""" Date of the next notification in monotonic nanoseconds
+		
+		- None if the timer is not running or has no more rings to trigger.
+		- Used by the scheduler to wake up the application only when needed.
+		"""
+		if not self.running or self.end:
+			return None
+		
+		if self._notif_ns is not None:
+			return self._notif_ns
+		
+		if self.notif_date is None:
+			return None
+		
+		# Converts the remaining time before the notification to the monotonic clock
+		delay = self.notif_date - datetime.now()
+		return time.monotonic_ns() + delay // timedelta(microseconds=1) * 1000
 	##
 	
 	#
@@ -114,6 +180,104 @@ class Timer:
 		
 		return display
 	
+	#
+	def to_record(self) -> dict:
+		""" Returns the attributes saved in the database
+			> When the timer is saved or written to the journal
+		
+		- Running timers also save their running state, see running_state().
+		- Paused timers are saved in their default state.
+		"""
+		record = {name: getattr(self, name) for name in self.persisted}
+		if self.running:
+			record.update(self.running_state())
+		return record
+	##
+	
+	#
+	def running_state(self) -> dict:
+		""" Returns the running state of the timer with absolute dates
+		
+		- Monotonic dates are only valid until the computer restarts,
+		  dates are saved in wall-clock nanoseconds since the epoch.
+		- end_time: end date, deadline: date of the next ring, absent once the last ring has been triggered,
+		  rings_left: number of remaining rings.
+		"""
+		if self.clock == "monotonic":
+			offset = time.time_ns() - time.monotonic_ns()
+			end_time = self._end_ns + offset
+			deadline = self._notif_ns + offset
+		else:
+			end_time = round(self._end_date.timestamp() * 1_000_000) * 1000
+			deadline = round(self.notif_date.timestamp() * 1_000_000) * 1000
+		
+		state = {"end_time": end_time, "rings_left": self._number_rings}
+		if not self.end:
+			state["deadline"] = deadline
+		return state
+	##
+	
+	#
+	def resume(self, end_time: int, rings_left: int, deadline: int | None = None, now: int | None = None) -> int:
+		""" Restarts a timer from its saved running state
+			> When loading the timers
+		
+		- The rings missed while the application was closed are computed at once,
+		  the timer triggers a single notification for all of them.
+		
+		Args:
+			- end_time (int): End date in wall-clock nanoseconds.
+			- rings_left (int): Number of remaining rings.
+			- deadline (int): Date of the next ring in wall-clock nanoseconds, None after the last ring.
+			- now (int): Current wall-clock date in nanoseconds.
+		
+		Returns:
+			- int: Number of missed rings.
+		"""
+		if now is None:
+			now = time.time_ns()
+		
+		self.running = True
+		self.remaining = now > end_time
+		self.end = deadline is None
+		self._number_rings = rings_left
+		
+		# The next ring is the last missed ring, the previous ones are skipped
+		missed = 0
+		interval = self._interval * 1_000_000_000
+		if deadline is not None and now > deadline:
+			missed = min((now - deadline) // interval + 1 if interval else rings_left + 1, rings_left + 1)
+			self._number_rings -= missed - 1
+			deadline += (missed - 1) * interval
+		
+		# Conversion of the dates to the clock of the timer
+		notif_time = end_time if deadline is None else deadline
+		if self.clock == "monotonic":
+			offset = time.monotonic_ns() - now
+			self._end_ns = end_time + offset
+			self._notif_ns = notif_time + offset
+			self._timeleft = (end_time - now) / 1e9
+		else:
+			self._end_date = new_date((end_time - now) / 1e9)
+			self.notif_date = new_date((notif_time - now) / 1e9)
+			self._timeleft = self._end_date - datetime.now()
+		
+		if missed:
+			# The ring was missed while the application was closed, it is not a scheduling lateness
+			self.ring((now - end_time) // 1_000_000_000, None)
+		
+		return missed
+	##
+	
+	#
+	def checkpoint(self):
+		""" Reports a change of the running state to the journal
+			> When the timer is started, stopped, reset or rings
+		"""
+		if self.journal is not None:
+			self.journal.mark(self)
+	##
+	
 	#
 	def check_message_lenght(self):
 		""" Checks title and message length
@@ -167,11 +331,16 @@ class Timer:
 			return
 		
 		# Set end date
-		self._end_date = new_date(self._timeleft)
-		self.notif_date = self._end_date
+		if self.clock == "monotonic":
+			self._end_ns = time.monotonic_ns() + duration_ns(self._timeleft)
+			self._notif_ns = self._end_ns
+		else:
+			self._end_date = new_date(self._timeleft)
+			self.notif_date = self._end_date
 		
 		# Set running attribute to True
 		self.running = True
+		self.checkpoint()
 	##
 	
 	#
@@ -190,6 +359,7 @@ class Timer:
 		
 		# Disable timer
 		self.running = False
+		self.checkpoint()
 		
 		# Resets remaining time if requested
 		if reset:
@@ -209,62 +379,103 @@ class Timer:
 		
 		# Ensures that the timer is active, otherwise nothing is done
 		if self.running:
-			now = datetime.now() # Retrieves the current date
-			
-			# Calculates remaining time using actual end date for display
-			self._timeleft = self._end_date - now
 			
-			# Calculation of time remaining before next ring
-			timeleft_notif = self.notif_date - now
+			if self.clock == "monotonic":
+				now = time.monotonic_ns() # Retrieves the current monotonic time
+				
+				# Calculates remaining time in seconds using the end date for display
+				self._timeleft = (self._end_ns - now) / 1e9
+				
+				# If the notification date is exceeded, triggers a notification
+				if now > self._notif_ns:
+					# Seconds elapsed since end date and lateness of the ring
+					self.ring((now - self._end_ns) // 1_000_000_000, now - self._notif_ns)
 			
-			# If the date is exceeded, triggers a notification
-			if timeleft_notif.total_seconds() < 0:
-				self.remaining = True
-				# Calculation of seconds elapsed since end date
-				# with formatting for notification display
-				seconds = format_duration((now - self._end_date).seconds)
+			else:
+				now = datetime.now() # Retrieves the current date
+				
+				# Calculates remaining time using actual end date for display
+				self._timeleft = self._end_date - now
 				
-				# If there are still additional rings to be triggered
-				if self._number_rings:
-					
-					# Retrieves notification message for local editing
-					message = self.message
-					
-					# If the default number of rings is different from the number of remaining rings
-					if self.number_rings != self._number_rings:
-						
-						# We modify the notification message to display the time elapsed since the end date.
-						message += f"\n - {seconds} !"
-					
-					# Trigger notification
-					send_notify(self.title, message)
-					
-					# Adds extra time for next notification
-					self.notif_date += timedelta(seconds=self._interval)
-					
-					self._number_rings -= 1 # Number of remaining rings -1
-					return
+				# Calculation of time remaining before next ring
+				timeleft_notif = self.notif_date - now
 				
-				# Last ring when number of rings is zero
-				if not self.end:
-					
-					# If it's not the first ring,
-					# because the default number is not zero
-					if self.number_rings:
-						# Change notification message to show elapsed time
-						message = self.message + f"\n - {seconds} !"
-					else:
-						# Otherwise, we keep the default message
-						message = self.message
-					
-					# Trigger notification
-					send_notify(self.title, message)
-					self.end = True
+				# If the date is exceeded, triggers a notification
+				if timeleft_notif.total_seconds() < 0:
+					# Seconds elapsed since end date and lateness of the ring
+					self.ring((now - self._end_date).seconds, -timeleft_notif // timedelta(microseconds=1) * 1000)
 		
 		# In all cases, the remaining time is returned, with formatting if requested.
 		return self.timeleft if _format else self._timeleft
 	##
 	
+	#
+	def ring(self, elapsed: int, lateness: int | None = 0):
+		""" Triggers a notification
+			> When the notification date has passed
+		
+		- Sends the notification and schedules the next ring if there are any left.
+		- Marks the timer as ended after the last ring.
+		- Records the lateness of the ring.
+		
+		Args:
+			- elapsed (int): Seconds elapsed since the end date.
+			- lateness (int): Nanoseconds elapsed since the notification date,
+				None for a ring missed while the application was closed, which is not recorded.
+		"""
+		self.remaining = True
+		
+		# Lateness is only recorded for rings that trigger a notification
+		if lateness is not None and (self._number_rings or not self.end):
+			from app.timer.metrics import get_recorder, SCHEDULING
+			get_recorder().record(self.uid, self.title, SCHEDULING, lateness)
+		
+		# Formatting of the seconds elapsed for notification display
+		seconds = format_duration(elapsed)
+		
+		# If there are still additional rings to be triggered
+		if self._number_rings:
+			
+			# Retrieves notification message for local editing
+			message = self.message
+			
+			# If the default number of rings is different from the number of remaining rings
+			if self.number_rings != self._number_rings:
+				
+				# We modify the notification message to display the time elapsed since the end date.
+				message += f"\n - {seconds} !"
+			
+			# Trigger notification
+			send_notify(self.title, message, self.uid)
+			
+			# Adds extra time for next notification
+			if self.clock == "monotonic":
+				self._notif_ns += self._interval * 1_000_000_000
+			else:
+				self.notif_date += timedelta(seconds=self._interval)
+			
+			self._number_rings -= 1 # Number of remaining rings -1
+			self.checkpoint()
+			return
+		
+		# Last ring when number of rings is zero
+		if not self.end:
+			
+			# If it's not the first ring,
+			# because the default number is not zero
+			if self.number_rings:
+				# Change notification message to show elapsed time
+				message = self.message + f"\n - {seconds} !"
+			else:
+				# Otherwise, we keep the default message
+				message = self.message
+			
+			# Trigger notification
+			send_notify(self.title, message, self.uid)
+			self.end = True
+			self.checkpoint()
+	##
+	
 	#
 	def reset(self):
 		""" Timer reset
@@ -278,58 +489,56 @@ class Timer:
 		self._timeleft = self.timer
 		self._end_date = None
 		self.notif_date = None
+		self._end_ns = None
+		self._notif_ns = None
 		self.remaining = False
 		self.end = False
 		self.check_number_rings()
 		self.check_times_between_rings()
+		self.checkpoint()
 	##
 ##
 
 
-#
-def format_duration(delta: int | float | timedelta, _format=True) -> str | tuple:
-	""" Formats time in hours, minutes and seconds
-
-	:param delta: Duration in seconds
-	:param _format: Output format
-	:return: Time formatted in hours, minutes and seconds
-	"""
-	result = "- " if isinstance(delta, timedelta) and delta.total_seconds() < 0 else ""
-	
-	# Take the absolute value of the duration in seconds
-	total_seconds = abs(delta.total_seconds()) if isinstance(delta, timedelta) else abs(delta)
-	
-	# Calculation of hours, minutes and seconds
-	hours, remainder = divmod(total_seconds, 3600)
-	minutes, seconds = divmod(remainder, 60)
+class Tracked:
+	""" Timer attribute whose changes are reported to the journal
 	
-	# If format not requested, returns raw values
-	if not _format:
-		return hours, minutes, seconds
+	- The value is kept in a private attribute of the timer. Reading it goes through
+	  __get__ and getattr, about 0.2 µs more than a plain attribute with CPython 3.11.
+	- Setting the initial value or an unchanged value is not reported.
+	"""
 	
-	# Convert to string
-	_hours = f"{int(hours)}h"
-	_minutes = f"{int(minutes)}m"
-	_seconds = f"{seconds:02}s" if isinstance(seconds, int) else f"{seconds:.2f}s"
+	def __init__(self, name: str):
+		self.name = name
+		self.attribute = f"_tracked_{name}"
 	
-	# Concatenation excluding null values
-	if hours:
-		result += f"{_hours} {_minutes} {_seconds}"
-	elif minutes:
-		result += f"{_minutes} {_seconds}"
-	else:
-		result += f"{_seconds}"
+	def __get__(self, timer, owner=None):
+		if timer is None:
+			return self
+		return getattr(timer, self.attribute)
 	
-	return result
+	def __set__(self, timer, value):
+		previous = getattr(timer, self.attribute, value)
+		setattr(timer, self.attribute, value)
+		
+		if previous != value and timer.journal is not None:
+			timer.journal.mark(timer)
 ##
 
 
+# The dataclass is created first, the descriptors then replace the default values of the class
+for _name in Timer.tracked:
+	setattr(Timer, _name, Tracked(_name))
+del _name
+
+
 #
-def send_notify(title, message):
+def send_notify(title, message, uid=None):
 	""" Triggers a notification
+	
+	- The notification is sent by the dispatcher worker threads,
+	  a slow notification backend does not block the timer update.
+	- Timers ringing together are merged into a single notification.
 	"""
-	notification.notify(
-		title=title,
-		message=message,
-		app_name="PyTimer",
-	)
+	from app.timer.notifier import get_notifier
+	get_notifier().submit(title, message, uid)
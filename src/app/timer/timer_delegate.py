@@ -0,0 +1,257 @@
+
+"""
+    $ -- TimerDelegate -- $
+Paints the rows of the timer list and handles the clicks on their buttons.
+"""
+
+from PySide6.QtCore import QEvent, QRect, QSize, Qt, Signal
+from PySide6.QtGui import QColor, QFont, QFontMetrics
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate
+
+from app.timer.timer_model import TimerRole
+from utils import get_icon
+
+# Dimensions of a row, in pixels
+BUTTON_SIZE = 38
+ICON_SIZE = 24
+MARGIN = 6
+SPACING = 8
+FONT_SIZE = 13
+
+class RenderCache:
+	""" State of each timer when its row was last painted
+	
+	- The delegate stores the state of a timer when it paints its row,
+	  the view only repaints the rows whose state has changed since.
+	- The state is the running state and the remaining time at the precision of its display,
+	  the title and the message are repainted by the dataChanged signal of the model.
+	- renders and skipped count the repaints requested and avoided.
+	"""
+	
+	def __init__(self):
+		self._states = {}
+		self.renders = 0
+		self.skipped = 0
+	##
+	
+	#
+	@staticmethod
+	def state(timer) -> tuple:
+		""" Returns what is painted of a timer, apart from its title
+		"""
+		return timer.running, timer.remaining, timer.timeleft_bucket
+	
+	#
+	def painted(self, timer):
+		""" Stores the state of a timer whose row has been painted
+		"""
+		self._states[timer.uid] = self.state(timer)
+	
+	#
+	def changed(self, timer) -> bool:
+		""" Returns True if the row of a timer must be repainted, and counts it
+		"""
+		if self._states.get(timer.uid) == self.state(timer):
+			self.skipped += 1
+			return False
+		
+		self.renders += 1
+		return True
+	
+	#
+	def discard(self, timer):
+		""" Forgets a deleted timer
+		"""
+		self._states.pop(timer.uid, None)
+	
+	#
+	def counters(self) -> dict:
+		""" Returns the number of repaints requested and avoided
+		"""
+		return {"renders": self.renders, "skipped": self.skipped}
+	##
+##
+
+
+class TimerDelegate(QStyledItemDelegate):
+	""" Delegate of the timer list
+	
+	- Paints each row like the former timer widget : play button, title and duration,
+	  time left and end date, reset and modify buttons.
+	- Buttons are only painted, clicks are hit-tested against their rectangle
+	  and sent by the clicked signal with the name of the button and the timer.
+	"""
+	
+	# Name of the clicked button and timer of the row
+	clicked = Signal(str, object)
+	
+	def __init__(self, parent=None):
+		super().__init__(parent)
+		self._pressed = None  # (row, button) pressed with the left button
+		self._hovered = None  # (row, button) under the mouse
+		
+		self._font = QFont()
+		self._font.setPixelSize(FONT_SIZE)
+		self._font.setWeight(QFont.DemiBold)
+		self._bold_font = QFont(self._font)
+		self._bold_font.setWeight(QFont.Bold)
+		self._line_height = QFontMetrics(self._bold_font).height()
+		
+		# State of the timers when their row was last painted
+		self.render_cache = RenderCache()
+	##
+	
+	#
+	@staticmethod
+	def button_rects(rect: QRect) -> dict:
+		""" Returns the rectangle of each button of a row
+		"""
+		top = rect.top() + (rect.height() - BUTTON_SIZE) // 2
+		modify = QRect(rect.right() - MARGIN - BUTTON_SIZE, top, BUTTON_SIZE, BUTTON_SIZE)
+		return {
+			"play": QRect(rect.left() + MARGIN, top, BUTTON_SIZE, BUTTON_SIZE),
+			"reset": modify.translated(-BUTTON_SIZE - MARGIN, 0),
+			"modify": modify,
+		}
+	
+	#
+	def button_at(self, rect: QRect, position) -> str | None:
+		""" Returns the name of the button under a position, None if there is none
+		"""
+		for name, button in self.button_rects(rect).items():
+			if button.contains(position):
+				return name
+		return None
+	##
+	
+	#
+	def clear_mouse_state(self) -> bool:
+		""" Forgets the hovered and pressed buttons
+			> When the mouse leaves the rows, or rows are inserted, removed or moved
+		
+		- Both are identified by their row, which no longer designates the same timer.
+		
+		Returns:
+			- bool: True if a button was hovered or pressed, and must be painted again.
+		"""
+		changed = self._hovered is not None or self._pressed is not None
+		self._hovered = None
+		self._pressed = None
+		return changed
+	##
+	
+	#
+	def sizeHint(self, option, index) -> QSize:
+		""" Height of the two lines of text, at least that of the buttons
+		"""
+		height = max(BUTTON_SIZE, 2 * self._line_height + SPACING) + 2 * MARGIN
+		return QSize(option.rect.width(), height)
+	
+	#
+	def paint(self, painter, option, index):
+		""" Paints the row of a timer
+		"""
+		timer = index.data(TimerRole)
+		if timer is None:
+			return
+		self.render_cache.painted(timer)
+		
+		# Background, selection and hover of the item, styled by the theme,
+		# the option is not filled with the data of the row, which is painted below
+		if option.widget is not None:
+			option.widget.style().drawControl(QStyle.CE_ItemViewItem, option, painter, option.widget)
+		
+		painter.save()
+		rect = option.rect
+		buttons = self.button_rects(rect)
+		row = index.row()
+		
+		# Buttons, the icons are shared by all rows
+		if timer.running:
+			play = "break"
+		elif timer.remaining:
+			play = "reset"
+		else:
+			play = "play"
+		icons = {"play": play, "reset": "reset", "modify": "modify"}
+		for name, button in buttons.items():
+			if self._hovered == (row, name):
+				hover = QColor(option.palette.highlight().color())
+				hover.setAlpha(60)
+				painter.setPen(Qt.NoPen)
+				painter.setBrush(hover)
+				painter.drawRoundedRect(button, 10, 10)
+			icon_rect = QRect(0, 0, ICON_SIZE, ICON_SIZE)
+			icon_rect.moveCenter(button.center())
+			get_icon(icons[name]).paint(painter, icon_rect)
+		
+		# Text columns between the buttons
+		left = buttons["play"].right() + SPACING
+		right = buttons["reset"].left() - SPACING
+		width = max(0, right - left)
+		title_width = width * 11 // 20
+		line_height = (rect.height() - 2 * MARGIN) // 2
+		top = rect.top() + MARGIN
+		
+		text_color = option.palette.text().color()
+		if timer.remaining:
+			time_color = QColor("red")
+		elif timer.running:
+			time_color = QColor("green")
+		else:
+			time_color = text_color
+		
+		lines = (
+			(self._bold_font, text_color, left, top, title_width, timer.title),
+			(self._font, text_color, left, top + line_height, title_width, f"⌚ {timer.duration}"),
+			(self._bold_font, time_color, left + title_width, top, width - title_width, f"⌛ {timer.timeleft}"),
+			(self._font, text_color, left + title_width, top + line_height, width - title_width,
+			 f"🔔 {timer.end_date}"),
+		)
+		for font, color, x, y, line_width, text in lines:
+			painter.setFont(font)
+			painter.setPen(color)
+			text = painter.fontMetrics().elidedText(text, Qt.ElideRight, line_width)
+			painter.drawText(QRect(x, y, line_width, line_height), Qt.AlignLeft | Qt.AlignVCenter, text)
+		
+		painter.restore()
+	##
+	
+	#
+	def editorEvent(self, event, model, option, index) -> bool:
+		""" Hit-tests the mouse events against the buttons of the row
+		
+		- A press on a button does not select the row nor start a drag,
+		  the button is clicked when the mouse is released over it.
+		"""
+		kind = event.type()
+		if kind not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease,
+						QEvent.MouseButtonDblClick, QEvent.MouseMove):
+			return super().editorEvent(event, model, option, index)
+		
+		row = index.row()
+		button = self.button_at(option.rect, event.position().toPoint())
+		
+		if kind == QEvent.MouseMove:
+			hovered = (row, button) if button else None
+			if hovered != self._hovered:
+				self._hovered = hovered
+				if option.widget is not None:
+					option.widget.viewport().update()
+			return False
+		
+		if button is None or event.button() != Qt.LeftButton:
+			self._pressed = None
+			return False
+		
+		if kind == QEvent.MouseButtonPress:
+			self._pressed = (row, button)
+		elif kind == QEvent.MouseButtonRelease:
+			if self._pressed == (row, button):
+				self.clicked.emit(button, index.data(TimerRole))
+			self._pressed = None
+		
+		# Double clicks on a button do not open the modification form
+		return True
+	##
+##
@@ -0,0 +1,167 @@
+
+"""
+    $ -- TimerModel -- $
+List model of the timers, displayed by the timer view through TimerDelegate.
+"""
+
+from PySide6.QtCore import QAbstractListModel, QByteArray, QMimeData, QModelIndex, Qt
+
+# Role returning the Timer object of a row
+TimerRole = Qt.UserRole + 1
+
+# MIME type of the dragged rows, only understood by the model itself
+MIME_TYPE = "application/x-pytimer-rows"
+
+
+class TimerModel(QAbstractListModel):
+	""" Model of the timer list
+	
+	- Rows hold Timer objects, the delegate reads what it paints from the timer itself,
+	  no widget is created per timer.
+	- Rows are moved by drag and drop through moveRows(), the timers keep their object.
+	- refresh() signals that the title or the message of timers has changed.
+	"""
+	
+	def __init__(self, timers=None, parent=None):
+		super().__init__(parent)
+		self._timers = list(timers or [])
+		self._rows = None  # Row of each timer, rebuilt after a change of the list
+	##
+	
+	#
+	@property
+	def timers(self) -> list:
+		""" Timers in the order of the list
+		"""
+		return list(self._timers)
+	
+	#
+	def timer(self, row: int):
+		""" Returns the timer of a row
+		"""
+		return self._timers[row]
+	
+	#
+	def row(self, timer) -> int:
+		""" Returns the row of a timer, -1 if it is not in the list
+		"""
+		if self._rows is None:
+			self._rows = {id(item): row for row, item in enumerate(self._timers)}
+		return self._rows.get(id(timer), -1)
+	##
+	
+	#
+	def rowCount(self, parent=QModelIndex()) -> int:
+		return 0 if parent.isValid() else len(self._timers)
+	
+	#
+	def data(self, index, role=Qt.DisplayRole):
+		""" Timer of the row and its title, the rest is painted by the delegate
+		"""
+		if not index.isValid():
+			return None
+		
+		timer = self._timers[index.row()]
+		if role == TimerRole:
+			return timer
+		if role == Qt.DisplayRole:
+			return timer.title
+		if role == Qt.ToolTipRole:
+			return timer.message
+		return None
+	##
+	
+	#
+	def flags(self, index):
+		""" Rows can be selected and dragged, drops are only accepted between rows
+		"""
+		if not index.isValid():
+			return Qt.ItemIsDropEnabled
+		return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled
+	
+	#
+	def supportedDropActions(self):
+		return Qt.MoveAction
+	
+	#
+	def mimeTypes(self) -> list:
+		return [MIME_TYPE]
+	
+	#
+	def mimeData(self, indexes) -> QMimeData:
+		""" Dragged rows, the timers themselves are moved by moveRows()
+		"""
+		mime_data = QMimeData()
+		rows = ",".join(str(index.row()) for index in indexes)
+		mime_data.setData(MIME_TYPE, QByteArray(rows.encode()))
+		return mime_data
+	##
+	
+	#
+	def append_timer(self, timer):
+		""" Adds a timer at the end of the list
+		"""
+		row = len(self._timers)
+		self.beginInsertRows(QModelIndex(), row, row)
+		self._timers.append(timer)
+		if self._rows is not None:
+			self._rows[id(timer)] = row
+		self.endInsertRows()
+	
+	#
+	def removeRows(self, row: int, count: int, parent=QModelIndex()) -> bool:
+		""" Removes timers from the list
+		"""
+		if parent.isValid() or row < 0 or row + count > len(self._timers) or count <= 0:
+			return False
+		
+		self.beginRemoveRows(parent, row, row + count - 1)
+		del self._timers[row:row + count]
+		self._rows = None
+		self.endRemoveRows()
+		return True
+	
+	#
+	def moveRows(self, source_parent, source_row: int, count: int, destination_parent, destination_child: int) -> bool:
+		""" Moves timers in the list
+			> When a row is dropped by drag and drop
+		
+		Args:
+			- destination_child (int): Row before which the timers are placed, in the list before the move.
+		"""
+		if source_parent.isValid() or destination_parent.isValid() or count <= 0:
+			return False
+		if source_row < 0 or source_row + count > len(self._timers):
+			return False
+		if not 0 <= destination_child <= len(self._timers):
+			return False
+		if source_row <= destination_child <= source_row + count:
+			return False
+		
+		if not self.beginMoveRows(source_parent, source_row, source_row + count - 1,
+								  destination_parent, destination_child):
+			return False
+		
+		moved = self._timers[source_row:source_row + count]
+		del self._timers[source_row:source_row + count]
+		if destination_child > source_row:
+			destination_child -= count
+		self._timers[destination_child:destination_child] = moved
+		self._rows = None
+		
+		self.endMoveRows()
+		return True
+	##
+	
+	#
+	def refresh(self, timers):
+		""" Signals that the data of timers has changed
+			> When a timer is modified by the form
+		"""
+		for timer in timers:
+			row = self.row(timer)
+			if row != -1:
+				index = self.index(row)
+				self.dataChanged.emit(index, index)
+	##
+##
@@ -6,12 +6,20 @@ File containing timer display view
 
 # Imports
 
-from PySide6.QtCore import QTimer
-from PySide6.QtWidgets import QWidget, QListWidget, QListWidgetItem, QVBoxLayout, QPushButton, QHBoxLayout, \
-	QAbstractItemView
+import time
 
+from PySide6.QtCore import QEvent, QRect, QTimer, Qt
+from PySide6.QtGui import QRegion
+from PySide6.QtWidgets import QWidget, QListView, QVBoxLayout, QPushButton, QHBoxLayout, QAbstractItemView
+
+from app.timer.journal import WriteBehindJournal
+from app.timer.metrics import TickStats
+from app.timer.notifier import close_notifier
+from app.timer.scheduler import create_scheduler
+from app.timer.timer import Timer
+from app.timer.timer_delegate import TimerDelegate
 from app.timer.timer_dialog import TimerDialog
-from app.timer.timer_widget import TimerWidget
+from app.timer.timer_model import TimerModel, TimerRole
 from app.timer.utils import load_timers, save_timers
 
 
@@ -59,15 +67,28 @@ class TimerView(QWidget):
 		self.btn_delete_timer.setFixedWidth(150)
 		self.hlayout.addWidget(self.btn_delete_timer)
 		
-		# Timer list
-		self.lst_timer = QListWidget()
+		# Timer list, the rows are painted by the delegate from the timers of the model
+		self.model = TimerModel(parent=self)
+		self.delegate = TimerDelegate(self)
+		
+		self.lst_timer = QListView()
+		self.lst_timer.setModel(self.model)
+		self.lst_timer.setItemDelegate(self.delegate)
+		self.lst_timer.setUniformItemSizes(True)
+		self.lst_timer.setMouseTracking(True)
 		self.lst_timer.setMinimumWidth(400)
 		self.vlayout.addWidget(self.lst_timer)
 		
 		self.lst_timer.setDragDropMode(QAbstractItemView.InternalMove)
+		self.lst_timer.setDefaultDropAction(Qt.MoveAction)
 		self.lst_timer.setAcceptDrops(True)
 		self.lst_timer.setDragEnabled(True)
 		self.lst_timer.setDropIndicatorShown(True)
+		
+		# Displayed rows and rectangle of the first one, computed again when the list is scrolled or resized
+		self._visible_key = None
+		self._visible_rows = range(0)
+		self._first_rect = QRect()
 	##
 	
 	#
@@ -97,11 +118,11 @@ class TimerView(QWidget):
 				margin-top: 5px;
 			}
 			
-			QListWidget {
+			QListView {
 				border-radius: 10px;
 			}
 			
-			QListWidget::item {
+			QListView::item {
 				border-radius: 20px;
 				margin: 3px;
 			}
@@ -114,8 +135,22 @@ class TimerView(QWidget):
 		self.btn_new_timer.clicked.connect(self.create_timer)
 		
 		# Connect timer selection in the list to a button activation method
-		self.lst_timer.currentItemChanged.connect(lambda: self.btn_delete_timer.setEnabled(True))
-		self.lst_timer.itemDoubleClicked.connect(self.get_timer)
+		self.lst_timer.selectionModel().currentChanged.connect(lambda: self.btn_delete_timer.setEnabled(True))
+		self.lst_timer.doubleClicked.connect(self.get_timer)
+		
+		# Buttons of the rows, painted by the delegate
+		self.delegate.clicked.connect(self.button_clicked)
+		
+		# Rows scrolled, moved or resized into view are updated before being painted
+		self.lst_timer.verticalScrollBar().valueChanged.connect(self.refresh_visible)
+		# Timers are only inserted at the end of the list, which does not change the displayed rows
+		for signal in (self.model.rowsRemoved, self.model.rowsMoved):
+			signal.connect(self.refresh_visible)
+		
+		# Hovered and pressed buttons are forgotten when the mouse leaves the rows or the rows change
+		self.lst_timer.viewport().installEventFilter(self)
+		for signal in (self.model.rowsInserted, self.model.rowsRemoved, self.model.rowsMoved, self.model.modelReset):
+			signal.connect(self.clear_mouse_state)
 		
 		# Connecting the delete button
 		self.btn_delete_timer.clicked.connect(self.delete_timer)
@@ -127,15 +162,38 @@ class TimerView(QWidget):
 		""" Setting default values
 		"""
 		
-		# Application QTimer used to refresh active timers
-		# and trigger timer notifications
+		# Scheduler of the next deadlines of running timers
+		self.scheduler = create_scheduler()
+		
+		# Single-shot QTimer armed on the earliest deadline
+		# used to trigger timer notifications
+		self.timer_deadline = QTimer()
+		self.timer_deadline.setSingleShot(True)
+		self.timer_deadline.setTimerType(Qt.PreciseTimer)
+		self.timer_deadline.timeout.connect(self.check_deadlines)
+		
+		# Application QTimer used to refresh the display of active timers
+		# Only runs while a timer is running and the view is displayed, can be disabled with refresh_display
+		self.refresh_display = True
+		self.refresh_interval = 20 # Refresh every 20 ms when the hundredths of a second are displayed
+		self.coarse_interval = 1000 # Refresh every second otherwise
 		self.timer_refresh = QTimer()
 		self.timer_refresh.timeout.connect(self.check_timer)
-		self.timer_refresh.start(20) # Checks every 20 ms
+		
+		# Running timers, by uid, the refresh only updates those of the displayed rows
+		# Kept up to date by schedule_timer() when a timer is started, stopped, reset or deleted
+		self.active_timers = {}
+		
+		# Duration of the refresh ticks
+		self.tick_stats = TickStats()
 		
 		# Adding existing timers to the list
 		for timer in load_timers():
 			self.add_timer(timer)
+		
+		# Journal of the timer changes, written shortly after each change
+		self.journal = WriteBehindJournal()
+		Timer.journal = self.journal
 	##
 	
 	#
@@ -145,27 +203,20 @@ class TimerView(QWidget):
 			> Triggered by form signal
 		
 		- Retrieves the timer provided by the form.
-		- Creates the timer widget for insertion in the list.
-		- Connects the change button signal to the corresponding method.
-		- Places the timer in its widget and adds it to the list.
+		- Adds the timer to the model, its row is painted by the delegate.
 		
 		:param timer: Timer
 		"""
 		
-		# Widget creation
-		self.item = QListWidgetItem()
-		self.timer_widget = TimerWidget(parent=self, timer=timer, main_window=self.main_window)
-		
-		# Modification signal connection
-		self.timer_widget.submit_timer.connect(self.create_timer)
+		# Add timer to list
+		self.model.append_timer(timer)
 		
-		# Add widget to list
-		self.item.setSizeHint(self.timer_widget.sizeHint())
-		self.lst_timer.addItem(self.item)
-		self.lst_timer.setItemWidget(self.item, self.timer_widget)
+		# Timers resumed at loading are scheduled
+		if timer.running:
+			self.schedule_timer(timer)
 		
 	
-	def create_timer(self, timer=None, widget=None):
+	def create_timer(self, timer=None):
 		""" Creating a new timer
 			> Triggered by the view creation button
 			> and the timer modification button
@@ -184,34 +235,257 @@ class TimerView(QWidget):
 			if dialog.exec():
 				timer = dialog.get_timer()
 				
-				# Adds the timer to the list widget
+				# Adds the timer to the list
 				self.add_timer(timer)
+				self.journal.mark(timer)
 		
 		# Edit mode
 		else:
 			
 			# Opens the editing window and retrieves the timer if the user has validated it.
+			duration = timer.duration
 			dialog = TimerDialog(self, timer)
 			if dialog.exec():
 				
 				# Modifies the existing timer,
 				timer = dialog.get_timer()
-				widget.timer = timer
 				
-				# Reset timer to update values
-				widget.reset_timer(check_duration=True)
+				# Reset timer to update values if its duration has been modified
+				if timer.duration != duration:
+					self.reset_timer(timer)
+				self.model.refresh([timer])
+	
+	#
+	def button_clicked(self, button, timer):
+		""" Triggers the action of a button of a row
+			> Triggered by the delegate
+		"""
+		if button == "play":
+			self.start_timer(timer)
+		elif button == "reset":
+			self.reset_timer(timer)
+		elif button == "modify":
+			self.create_timer(timer)
+	
+	#
+	def start_timer(self, timer):
+		""" Starts, stops or resets a timer
+		
+		- If the timer is inactive, it will be started.
+		
+		- If in progress, it will be stopped and can be restarted.
+		
+		- If it is running and finished, it will be stopped and reset.
+		"""
+		
+		if timer.remaining:
+			if timer.running:
+				# If the timer is running but has passed its end date, it is stopped.
+				timer.stop_timer()
+				self.schedule_timer(timer)
+				self.update_rows([timer])
+				return
+			
+			# If the timer has ended and already stopped, it is reset.
+			self.reset_timer(timer)
+			return
+		
+		# If the timer is inactive or paused, start it, a running timer is stopped.
+		timer.start_timer()
+		self.schedule_timer(timer)
+		self.update_rows([timer])
+	
+	#
+	def reset_timer(self, timer):
+		""" Resets a timer to its default duration
+		"""
+		timer.reset()
+		self.schedule_timer(timer)
+		self.update_rows([timer])
 	
 	def check_timer(self):
-		""" Update active timers
+		""" Update the display of active timers
 			> Triggered by refresh QTimer
 			
-			- Scroll through all the widgets in the list to update the remaining time.
-			- All the updating logic is then carried out in the timer widgets and in the timers themselves.
+			- Updates the remaining time of the running timers of the displayed rows, then repaints them.
+			- The cost of a tick only depends on the number of displayed rows, not on the length of the list,
+			  the other timers are updated when they are scrolled into view, see refresh_visible().
+			- Notifications do not depend on the refresh, they are triggered by the deadline QTimer.
+			- All the updating logic is carried out in the timers themselves.
+			- Stops the refresh when no timer is running anymore.
+			- The duration of each tick is recorded in tick_stats.
+		"""
+		start = time.perf_counter_ns()
+		
+		# Update the displayed running timers
+		rows = self.visible_rows() if self.active_timers else range(0)
+		running = self.visible_timers(rows)
+		for timer in running:
+			timer.set_timeleft()
+		
+		self.update_rows(running, rows)
+		
+		if not self.active_timers:
+			self.timer_refresh.stop()
+		
+		self.tick_stats.record(time.perf_counter_ns() - start, len(running))
+	
+	#
+	def visible_rows(self) -> range:
+		""" Returns the rows displayed in the viewport, an empty range if the list is not displayed
+		
+		- Rows have the same size, the displayed rows are deduced from the first one.
+		- Computed again only when the list is scrolled or resized, or its number of rows changes.
+		"""
+		viewport = self.lst_timer.viewport()
+		if not viewport.isVisible():
+			return range(0)
+		
+		key = (self.lst_timer.verticalScrollBar().value(), viewport.size(), self.model.rowCount())
+		if key == self._visible_key:
+			return self._visible_rows
+		
+		area = viewport.rect()
+		first = self.lst_timer.indexAt(area.topLeft())
+		if not first.isValid():
+			return range(0)
+		
+		rect = self.lst_timer.visualRect(first)
+		last = min(first.row() + (area.bottom() - rect.top()) // rect.height(), self.model.rowCount() - 1)
+		
+		self._visible_key = key
+		self._visible_rows = range(first.row(), last + 1)
+		self._first_rect = rect
+		return self._visible_rows
+	
+	#
+	def visible_timers(self, rows: range | None = None) -> list:
+		""" Returns the running timers of the displayed rows
+		"""
+		if rows is None:
+			rows = self.visible_rows()
+		timers = (self.model.timer(row) for row in rows)
+		return [timer for timer in timers if timer.running]
+	
+	#
+	def refresh_visible(self):
+		""" Updates the remaining time of the running timers of the displayed rows
+			> When the list is scrolled or resized, or its rows are removed or moved,
+			  before the rows brought into view are painted
+		"""
+		for timer in self.visible_timers():
+			timer.set_timeleft()
+	
+	#
+	def schedule_timer(self, timer):
+		""" Updates the deadline of a timer in the scheduler
+			> When a timer is started, stopped, reset or deleted
+		
+		- Re-arms the deadline QTimer on the earliest deadline.
+		- Adds the timer to the registry of running timers, or removes it.
+		- Adapts the display refresh to the running timers.
+		"""
+		self.scheduler.schedule(timer)
+		self.arm_deadline()
+		
+		if timer.running:
+			self.active_timers[timer.uid] = timer
+		else:
+			self.active_timers.pop(timer.uid, None)
+		
+		self.update_refresh()
+	
+	#
+	def update_refresh(self):
+		""" Adapts the display refresh to what is displayed
+			> When a timer is started or stopped, the view is shown or hidden, or the precision changes
+		
+		- Stopped when no timer is running, or while the view is hidden or minimized,
+		  the notifications are triggered by the deadline QTimer in all cases.
+		- Every refresh_interval when the hundredths of a second are displayed, every coarse_interval otherwise.
+		"""
+		if not (self.refresh_display and self.active_timers and self.displayed()):
+			self.timer_refresh.stop()
+			return
+		
+		interval = self.refresh_interval if Timer.centiseconds else self.coarse_interval
+		if not self.timer_refresh.isActive() or self.timer_refresh.interval() != interval:
+			self.timer_refresh.start(interval)
+	
+	#
+	def displayed(self) -> bool:
+		""" Returns True if the view is visible, in a window which is not minimized
+		"""
+		return self.isVisible() and not self.window().isMinimized()
+	
+	#
+	def set_centiseconds(self, centiseconds: bool):
+		""" Displays the remaining times to the hundredth of a second, or in whole seconds
+			> When the option is changed
+		"""
+		Timer.centiseconds = centiseconds
+		self.lst_timer.viewport().update()
+		self.update_refresh()
+	
+	#
+	def arm_deadline(self):
+		""" Arms the single-shot QTimer on the earliest deadline, stops it if there is none
+		"""
+		timeout = self.scheduler.timeout()
+		
+		if timeout is None:
+			self.timer_deadline.stop()
+		else:
+			self.timer_deadline.start(timeout)
+	
+	#
+	def check_deadlines(self):
+		""" Triggers the notifications of timers whose deadline has passed
+			> Triggered by the deadline QTimer
+		
+		- Only the due timers are updated, then rescheduled on their next deadline.
+		"""
+		due = self.scheduler.pop_due()
+		for timer in due:
+			timer.set_timeleft()
+			self.scheduler.schedule(timer)
+		
+		self.arm_deadline()
+		
+		# Rings change the display of the timers, even when the refresh is disabled
+		self.update_rows(due)
+	
+	#
+	def update_rows(self, timers, rows: range | None = None):
+		""" Repaints the visible rows of timers whose running state or remaining time has changed
+		
+		- Only the title and the message are data of the model, the rest of a row is painted
+		  from the timer, so the rows are repainted without a dataChanged signal,
+		  which would make the list lay out all its rows again.
+		- Rows whose display has not changed since they were painted are skipped, see RenderCache.
+		- The changed rows are repainted together, in a single paint of the viewport.
+		
+		Args:
+			- rows (range): Rows displayed in the viewport, if already known.
 		"""
+		# Rows displayed in the viewport, the others are painted when they are scrolled into view
+		if rows is None:
+			rows = self.visible_rows()
+		if not rows:
+			return
+		
+		render_cache = self.delegate.render_cache
+		changed = [row for row, timer in ((self.model.row(timer), timer) for timer in timers)
+				   if row in rows and render_cache.changed(timer)]
+		if not changed:
+			return
 		
-		# Browse widgets to update timers
-		for widget in self.lst_timer.findChildren(TimerWidget):
-			widget.update_timeleft()
+		# Rows have the same size, their rectangle is deduced from that of the first displayed row
+		first = self._first_rect
+		region = QRegion()
+		for row in changed:
+			region += first.translated(0, (row - rows.start) * first.height())
+		self.lst_timer.viewport().update(region)
 	
 	def delete_timer(self):
 		"""
@@ -219,15 +493,23 @@ class TimerView(QWidget):
 			> Triggered by the delete button
 		"""
 		# Get the index of the selected item
-		current_row = self.lst_timer.currentRow()
+		current_row = self.lst_timer.currentIndex().row()
 		
 		# If no element is selected, current_row will be -1
 		if current_row != -1:
-			# Remove and delete element
-			timer = self.lst_timer.takeItem(current_row)
+			# Stops scheduling the timer of the element
+			timer = self.model.timer(current_row)
+			self.scheduler.cancel(timer)
+			self.arm_deadline()
+			self.active_timers.pop(timer.uid, None)
+			self.delegate.render_cache.discard(timer)
+			self.journal.mark_deleted(timer)
+			
+			# Remove element
+			self.model.removeRow(current_row)
 		
 		# Check if there is a timer left in the list to disable the delete button
-		if self.lst_timer.count() == 0:
+		if self.model.rowCount() == 0:
 			self.btn_delete_timer.setEnabled(False)
 	##
 	
@@ -237,53 +519,83 @@ class TimerView(QWidget):
 		Property returning the list of timers
 			> Used to save timers when closing the view
 			
-		- Retrieves timers from the list widget and returns them
+		- Retrieves timers from the model, in the order of the list
 		"""
-		# Retrieves the number of timers to check that there are any and loop over the list
-		count = self.lst_timer.count()
-		
-		# If no timer, returns an empty list
-		if not count:
-			return []
-		
-		# Creating the return list
-		timers = []
-		
-		# Loop over each list item
-		for row in range(count):
-			
-			# Retrieve line item and widget
-			item = self.lst_timer.item(row)
-			widget_timer = self.lst_timer.itemWidget(item)
-			
-			# Retrieves widget timer
-			if widget_timer and hasattr(widget_timer, 'timer'):
-				timer = widget_timer.timer
-				timers.append(timer)
-		
-		# Returns the timer list
-		return timers
+		return self.model.timers
 	##
 	
 	#
-	def get_timer(self, item):
+	def get_timer(self, index):
 		"""
 			Retrieves a timer from the list
 				> When double-clicked
 		"""
-		# Retrieve item widget
-		widget_timer = self.lst_timer.itemWidget(item)
+		# Retrieves the timer of the row
+		timer = index.data(TimerRole)
+		
+		# Open the modification form
+		if timer is not None:
+			self.create_timer(timer)
+	##
+	
+	def clear_mouse_state(self):
+		""" Forgets the hovered and pressed buttons of the delegate, and repaints them if needed
+		"""
+		if self.delegate.clear_mouse_state():
+			self.lst_timer.viewport().update()
+	
+	#
+	def eventFilter(self, watched, event) -> bool:
+		""" Forgets the hovered button when the mouse leaves the rows of the list,
+			updates the rows brought into view when the list is resized
+		"""
+		if watched is self.lst_timer.viewport():
+			kind = event.type()
+			if kind == QEvent.Resize:
+				self.refresh_visible()
+			elif kind == QEvent.Leave:
+				self.clear_mouse_state()
+			elif kind == QEvent.MouseMove and not self.lst_timer.indexAt(event.position().toPoint()).isValid():
+				self.clear_mouse_state()
 		
-		# Retrieves widget timer
-		if widget_timer and hasattr(widget_timer, 'timer'):
-			timer = widget_timer.timer
+		return super().eventFilter(watched, event)
+	
+	#
+	def changeEvent(self, event):
+		""" Computes the displayed rows again when the style changes the size of the rows
+		"""
+		super().changeEvent(event)
 		
-			# Open the modification form
-			self.create_timer(timer, widget_timer)
+		if event.type() == QEvent.StyleChange:
+			self._visible_key = None
+	
+	#
+	def showEvent(self, event):
+		""" Updates the running timers, then restarts the display refresh
+			> When the view is displayed, or its window is restored
+		"""
+		super().showEvent(event)
+		for timer in self.active_timers.values():
+			timer.set_timeleft()
+		self.update_refresh()
+	
+	#
+	def hideEvent(self, event):
+		""" Stops the display refresh
+			> When the view is hidden, its window is hidden to the tray or minimized
+		"""
+		super().hideEvent(event)
+		self.timer_refresh.stop()
 	##
 	
 	def closeEvent(self, event):
 		""" Close view
+		
+		- Stops the journal, then saves all timers, including their order.
+		- Sends the notifications still pending.
 		"""
+		self.journal.close()
 		save_timers(self.timers)
+		Timer.journal = None
+		close_notifier()
 		pass
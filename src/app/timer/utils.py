@@ -3,8 +3,12 @@
 	Script containing useful application functions
 """
 
+import json
+import os
+import time
 from datetime import datetime, timedelta
-from src.app.timer.config import DB_TIMER
+
+from app.timer import config
 
 
 
@@ -13,32 +17,51 @@ def load_timers():
 	Loading timers from the database
 		> When opening the timer application
 	
-	- Retrieves timers from the database.
+	- Retrieves timers from the storage backend, see STORAGE_BACKEND.
+	- Applies the changes of the journal written since the last save.
 	- Create timers before returning them.
+	- Running timers are resumed, the rings missed while the application
+	  was closed are computed at once for each timer.
 	
 	Returns:
 		list: Timer list
 	"""
 	
-	from src.app.timer.timer import Timer
+	from app.timer.timer import Timer
+	from app.timer.journal import replay_journal
+	from app.timer.storage import get_storage
 	
-	# Retrieves timers from database
-	data = DB_TIMER.all()
+	# Retrieves timers from database, updated by the journal
+	data = replay_journal(get_storage().load())
 	
 	# If the database is empty, basic timers are returned
 	if not data:
-		return default_timers()
+		timers = default_timers()
 	
 	# If timers already exist
 	else:
 		# Creating timers
 		timers = []
-		for timer in data:
-			timer = Timer(**timer)
+		missed = 0
+		now = time.time_ns()
+		for record in data:
+			state = {key: record.pop(key) for key in Timer.state if key in record}
+			timer = Timer(**record)
+			
+			# Resumes the running timers
+			if state:
+				missed += timer.resume(now=now, **state)
+			
 			timers.append(timer)
-		
-		# Return timers
-		return timers
+	
+	# Timers without identifier in the database are saved at once,
+	# so that the journal can refer to them,
+	# as well as timers that have rung, so that their rings are not triggered again
+	if not data or missed or any("uid" not in record for record in data):
+		save_timers(timers)
+	
+	# Return timers
+	return timers
 ##
 
 
@@ -48,18 +71,43 @@ def save_timers(timers):
 	Saving timers in the database
 		> when closing the timer view
 	
+	- All timers are written at once by the storage backend,
+	  in a single file write or a single transaction.
+	- Running timers are saved with their running state, they are resumed by load_timers().
+	- The journal is emptied, its changes are included in the saved timers.
+	
 	Args:
 		timers : list
 			List of timers to save
 	"""
 	
-	# Deletes the previous database
-	DB_TIMER.truncate()
+	from app.timer.storage import get_storage
+	
+	get_storage().save([timer.to_record() for timer in timers])
+	
+	from app.timer.timer import Timer
+	if Timer.journal is not None:
+		Timer.journal.clear()
+	elif os.path.exists(config.journal_path):
+		os.remove(config.journal_path)
+##
+
+
+#
+def write_json_atomic(path: str, data, indent: int | None = 4):
+	""" Writes a JSON file in a single atomic operation
+	
+	- Same guarantees as utils.write_bytes_atomic, the file is either the previous one or the new one.
 	
-	# Saves timers in database
-	for timer in timers:
-		timer.reset()
-		DB_TIMER.insert(timer.__dict__)
+	Args:
+		- path (str): Path of the file.
+		- data: Data to serialize.
+		- indent (int): JSON indentation, same as the TinyDB database by default.
+	"""
+	from utils import write_bytes_atomic
+	
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	write_bytes_atomic(path, json.dumps(data, indent=indent).encode())
 ##
 
 
@@ -69,7 +117,7 @@ def default_timers():
 			> When the database contained none
 	"""
 	
-	from src.app.timer.timer import Timer
+	from app.timer.timer import Timer
 	
 	# Create a list of 3 default timers
 	default_timers = [
@@ -102,15 +150,15 @@ def new_date(seconds: int | float | timedelta = 10) -> datetime:
 	""" Calculates a new date
 	
 	- Adds a specified number of seconds to the current time to create the new date.
-
+	
 	Args:
 		- seconds (int, float, timedelta): The number of seconds
 			à add to the current time to calculate the new date.
 		- now (bool): If True, the function will return the current time.
-
+	
 	Returns:
 		- datetime: Calculated future date.
-
+	
 	Examples:
 		To obtain a date 20 seconds in the future:
 			>>> new_date(seconds=20)
@@ -128,5 +176,25 @@ def new_date(seconds: int | float | timedelta = 10) -> datetime:
 	
 	if isinstance(seconds, timedelta):
 		return current_time + seconds
-
+	
 	return current_time + timedelta(seconds=seconds)
+##
+
+
+#
+def duration_ns(seconds: int | float | timedelta) -> int:
+	""" Converts a duration to nanoseconds
+	
+	- Used to compute monotonic deadlines from a remaining time.
+	
+	Args:
+		- seconds (int, float, timedelta): Duration to convert.
+	
+	Returns:
+		- int: Duration in nanoseconds.
+	"""
+	
+	if isinstance(seconds, timedelta):
+		return seconds // timedelta(microseconds=1) * 1000
+	
+	return int(seconds * 1_000_000_000)
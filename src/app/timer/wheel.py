@@ -0,0 +1,266 @@
+
+"""
+    $ -- TimingWheel -- $
+Hierarchical timing wheel, scheduling backend for large numbers of timers.
+"""
+
+import time
+
+# Number of slots of each level, the first level has the finest granularity
+LEVEL_BITS = (8, 6, 6, 6)
+
+
+class TimingWheel:
+	""" Hierarchical timing wheel of the next deadlines of running timers
+	
+	- Same interface as TimerScheduler, it can replace it in the timer view.
+	- Insertion and cancellation are O(1), a deadline is placed in a slot
+	  according to its distance from the current tick.
+	- With a 10 ms tick, the levels cover 2.56 s, 2.7 min, 2.9 h and 7.7 days,
+	  later deadlines wait in an overflow slot.
+	- Deadlines are expressed in nanoseconds of the monotonic clock (time.monotonic_ns).
+	"""
+	
+	def __init__(self, tick_ns: int = 10_000_000, now: int | None = None):
+		self.tick_ns = tick_ns
+		
+		# Slots of each level, a slot maps a timer key to its (deadline, timer)
+		self._levels = [[{} for _ in range(1 << bits)] for bits in LEVEL_BITS]
+		self._overflow = {}
+		
+		# Number of deadlines of each level, the last count is the overflow slot
+		self._counts = [0] * (len(LEVEL_BITS) + 1)
+		
+		# Position of each scheduled timer, (level, slot)
+		self._where = {}
+		
+		# Shift, mask and limit of each level, in ticks
+		self._shifts = []
+		self._placement = []
+		shift = 0
+		for level, bits in enumerate(LEVEL_BITS):
+			self._shifts.append(shift)
+			self._placement.append((1 << (shift + bits), shift, (1 << bits) - 1, level))
+			shift += bits
+		
+		# Current tick, all earlier ticks have been processed
+		if now is None:
+			now = time.monotonic_ns()
+		self._current = now // tick_ns
+	##
+	
+	def __len__(self):
+		""" Number of scheduled timers
+		"""
+		return len(self._where)
+	
+	def __contains__(self, timer):
+		""" Checks whether a timer is scheduled
+		"""
+		return id(timer) in self._where
+	
+	#
+	def schedule(self, timer) -> bool:
+		""" Schedules the next deadline of a timer
+			> When a timer is started, stopped, reset or has rung
+		
+		- Replaces the previous deadline of the timer if any.
+		- Timers without a next deadline (stopped or finished) are simply removed.
+		
+		Returns:
+			- bool: True if the timer has been scheduled.
+		"""
+		self.cancel(timer)
+		
+		deadline = timer.next_deadline
+		if deadline is None:
+			return False
+		
+		self._insert(id(timer), deadline, timer)
+		return True
+	##
+	
+	#
+	def cancel(self, timer):
+		""" Removes a timer from the wheel
+		"""
+		where = self._where.pop(id(timer), None)
+		if where is None:
+			return
+		
+		level, slot = where
+		del slot[id(timer)]
+		self._counts[level] -= 1
+	##
+	
+	#
+	def _insert(self, key: int, deadline: int, timer):
+		""" Places a deadline in the slot matching its distance from the current tick
+		"""
+		current = self._current
+		tick = deadline // self.tick_ns
+		if tick < current:
+			tick = current
+		delta = tick - current
+		
+		for limit, shift, mask, level in self._placement:
+			if delta < limit:
+				slot = self._levels[level][(tick >> shift) & mask]
+				break
+		else:
+			# Too far for the wheel
+			level = len(LEVEL_BITS)
+			slot = self._overflow
+		
+		slot[key] = (deadline, timer)
+		self._counts[level] += 1
+		self._where[key] = (level, slot)
+	##
+	
+	#
+	def _cascade(self):
+		""" Moves the deadlines of the upper levels closer
+			> When the current tick starts a new turn of the first level
+		
+		- Each upper level whose slot is reached redistributes its deadlines in the lower levels.
+		"""
+		for level in range(1, len(LEVEL_BITS)):
+			slot = (self._current >> self._shifts[level]) & ((1 << LEVEL_BITS[level]) - 1)
+			self._redistribute(self._levels[level][slot], level)
+			
+			# The next level is only reached when this one starts a new turn
+			if slot:
+				return
+		
+		# All levels start a new turn, deadlines of the overflow slot are placed again
+		self._redistribute(self._overflow, len(LEVEL_BITS))
+	##
+	
+	#
+	def _redistribute(self, entries: dict, level: int):
+		""" Empties a slot and places its deadlines again
+		"""
+		if not entries:
+			return
+		
+		items = list(entries.items())
+		entries.clear()
+		self._counts[level] -= len(items)
+		
+		for key, (deadline, timer) in items:
+			del self._where[key]
+			self._insert(key, deadline, timer)
+	##
+	
+	#
+	def _expire(self, slot: dict, due: list, now: int | None = None):
+		""" Removes the deadlines of a first level slot
+		
+		- If now is supplied, only the deadlines that have passed are removed.
+		"""
+		for key, (deadline, timer) in list(slot.items()):
+			if now is None or deadline <= now:
+				del slot[key]
+				del self._where[key]
+				self._counts[0] -= 1
+				due.append(timer)
+	##
+	
+	#
+	def next_deadline(self) -> int | None:
+		""" Returns the earliest deadline in monotonic nanoseconds, None if nothing is scheduled
+		
+		- Only the first non-empty slot of each level is examined.
+		"""
+		candidates = []
+		
+		for level, bits in enumerate(LEVEL_BITS):
+			if not self._counts[level]:
+				continue
+			
+			size = 1 << bits
+			index = (self._current >> self._shifts[level]) & (size - 1)
+			
+			# In the upper levels, the slot of the current tick holds deadlines one turn away
+			# and is examined last
+			start = 0 if level == 0 else 1
+			for offset in range(start, start + size):
+				slot = self._levels[level][(index + offset) % size]
+				if slot:
+					candidates.append(min(deadline for deadline, _ in slot.values()))
+					break
+		
+		if self._overflow:
+			candidates.append(min(deadline for deadline, _ in self._overflow.values()))
+		
+		return min(candidates) if candidates else None
+	##
+	
+	#
+	def timeout(self, now: int | None = None) -> int | None:
+		""" Returns the delay in milliseconds before the earliest deadline
+		
+		- Rounded up so that a single-shot timer never fires before the deadline.
+		- None if nothing is scheduled.
+		"""
+		deadline = self.next_deadline()
+		if deadline is None:
+			return None
+		
+		if now is None:
+			now = time.monotonic_ns()
+		
+		return max(0, -((now - deadline) // 1_000_000))
+	##
+	
+	#
+	def pop_due(self, now: int | None = None) -> list:
+		""" Removes and returns the timers whose deadline has passed
+			> When the single-shot QTimer fires
+		
+		- Advances the wheel to the current tick, empty turns of the first level are skipped.
+		- Due timers are no longer scheduled, they must be rescheduled after being updated.
+		"""
+		if now is None:
+			now = time.monotonic_ns()
+		
+		target = now // self.tick_ns
+		first_level = self._levels[0]
+		mask = (1 << LEVEL_BITS[0]) - 1
+		due = []
+		
+		# Nothing scheduled, the wheel can jump directly to the current tick
+		if not self._where:
+			self._current = max(self._current, target)
+			return due
+		
+		while self._current < target:
+			if self._counts[0]:
+				# Every deadline of a past tick is due
+				self._expire(first_level[self._current & mask], due)
+				self._current += 1
+			else:
+				# Skip to the end of the turn of the first level
+				self._current = min(target, (self._current | mask) + 1)
+			
+			if not self._current & mask:
+				self._cascade()
+		
+		# Deadlines of the current tick that have passed
+		self._expire(first_level[self._current & mask], due, now)
+		
+		return due
+	##
+	
+	#
+	def clear(self):
+		""" Removes all scheduled timers
+		"""
+		for level in self._levels:
+			for slot in level:
+				slot.clear()
+		self._counts = [0] * (len(LEVEL_BITS) + 1)
+		self._overflow.clear()
+		self._where.clear()
+	##
+##
@@ -0,0 +1,7 @@
+
+"""
+	Benchmarks of the application hot paths
+
+- Run from the src folder, for example :
+	python -m benchmarks.bench_timer
+"""
@@ -0,0 +1,119 @@
+
+"""
+	Command line of the benchmark suite
+
+- Runs the suite and saves the results as JSON :
+	python -m benchmarks run -o results.json
+- Compares two results and flags the regressions beyond a threshold :
+	python -m benchmarks compare baseline.json results.json --threshold 10
+"""
+
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime
+
+from benchmarks.common import report
+
+
+def run(names: list | None = None) -> dict:
+	""" Runs the benchmarks of the suite
+	
+	Args:
+		- names (list): Benchmarks to run, all of them if not supplied.
+	
+	Returns:
+		- dict: Results with the information of the machine.
+	"""
+	from benchmarks.suite import BENCHMARKS
+	
+	results = {}
+	for name, (func, unit) in BENCHMARKS.items():
+		if names and not any(part in name for part in names):
+			continue
+		value = func()
+		results[name] = {"value": value, "unit": unit}
+		report(name, value, unit)
+	
+	return {
+		"date": datetime.now().isoformat(timespec="seconds"),
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"results": results,
+	}
+##
+
+
+#
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+	""" Compares two results
+	
+	Args:
+		- threshold (float): Tolerated slowdown in percent.
+	
+	Returns:
+		- list: Names of the benchmarks slower than the baseline beyond the threshold.
+	"""
+	regressions = []
+	
+	for name, result in current["results"].items():
+		if name not in baseline["results"]:
+			continue
+		
+		before = baseline["results"][name]["value"]
+		after = result["value"]
+		change = (after - before) / before * 100 if before else 0.0
+		
+		status = ""
+		if change > threshold:
+			status = "REGRESSION"
+			regressions.append(name)
+		elif change < -threshold:
+			status = "improvement"
+		
+		print(f"{name:<45} {before:>14.1f} {after:>14.1f} {change:>+8.1f} % {status}")
+	
+	return regressions
+##
+
+
+#
+def main():
+	""" Parses the command line
+	"""
+	parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+									 formatter_class=argparse.RawDescriptionHelpFormatter)
+	commands = parser.add_subparsers(dest="command", required=True)
+	
+	parser_run = commands.add_parser("run", help="runs the benchmark suite")
+	parser_run.add_argument("-o", "--output", help="JSON file of the results")
+	parser_run.add_argument("names", nargs="*", help="runs only the benchmarks containing one of these names")
+	
+	parser_compare = commands.add_parser("compare", help="compares two results")
+	parser_compare.add_argument("baseline", help="JSON file of the reference results")
+	parser_compare.add_argument("current", help="JSON file of the results to check")
+	parser_compare.add_argument("--threshold", type=float, default=10.0, help="tolerated slowdown in percent")
+	
+	args = parser.parse_args()
+	
+	if args.command == "run":
+		results = run(args.names)
+		if args.output:
+			with open(args.output, "w") as f:
+				json.dump(results, f, indent=4)
+		return
+	
+	with open(args.baseline) as f:
+		baseline = json.load(f)
+	with open(args.current) as f:
+		current = json.load(f)
+	
+	regressions = compare(baseline, current, args.threshold)
+	if regressions:
+		print(f"{len(regressions)} regression(s) beyond {args.threshold} %")
+		sys.exit(1)
+
+
+if __name__ == '__main__':
+	main()
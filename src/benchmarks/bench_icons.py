@@ -0,0 +1,110 @@
+"""
+	Benchmark of the icon registry
+
+- Creates the buttons of WIDGETS timer rows, with the offscreen Qt platform, and renders their icons once
+  like their first paint, then switches the play button of each row to the pause icon like a click.
+- Compares a QIcon built from its file for each button, as the former timer widget did,
+  with the icons shared by utils.get_icon().
+- Each mode runs in a new interpreter, so that the memory of one mode is not reused by the other.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.bench_view import resident_memory
+from benchmarks.common import report
+
+# Number of timer rows, of three buttons each
+WIDGETS = 1000
+
+# Size of the icons in the buttons
+ICON_SIZE = 24
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+
+def create_buttons(icon) -> tuple:
+	""" Creates the buttons of WIDGETS rows, renders their icons, then clicks their play button
+	
+	Args:
+		- icon (callable): Returns the icon of a name.
+	
+	Returns:
+		- tuple: Duration in seconds, buttons of each row.
+	"""
+	from PySide6.QtWidgets import QPushButton
+	
+	start = time.perf_counter()
+	
+	rows = []
+	for _ in range(WIDGETS):
+		buttons = {name: QPushButton() for name in ("play", "reset", "modify")}
+		for name, button in buttons.items():
+			button.setIcon(icon(name))
+			button.icon().pixmap(ICON_SIZE, ICON_SIZE)
+		rows.append(buttons)
+	
+	for buttons in rows:
+		buttons["play"].setIcon(icon("break"))
+		buttons["play"].icon().pixmap(ICON_SIZE, ICON_SIZE)
+	
+	return time.perf_counter() - start, rows
+
+
+def measure(mode: str) -> dict:
+	""" Measures a mode in the current interpreter
+	
+	Returns:
+		- dict: Duration in ms and memory in KiB.
+	"""
+	os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+	from PySide6.QtGui import QIcon
+	from PySide6.QtWidgets import QApplication
+	
+	import utils
+	
+	application = QApplication.instance() or QApplication()
+	
+	if mode == "files":
+		def icon(name):
+			return QIcon(str(utils.ICONS[name]))
+	else:
+		icon = utils.get_icon
+	
+	memory = resident_memory()
+	elapsed, rows = create_buttons(icon)  # The buttons are kept until the memory is measured
+	return {"time": elapsed * 1000, "memory": (resident_memory() - memory) / 1024}
+
+
+def run(mode: str) -> dict:
+	""" Measures a mode in a new interpreter
+	"""
+	result = subprocess.run(
+		[sys.executable, "-m", "benchmarks.bench_icons", mode],
+		cwd=SRC_DIR, capture_output=True, text=True, check=True,
+	)
+	return json.loads(result.stdout.splitlines()[-1])
+
+
+def main():
+	""" Runs the benchmark, or measures a single mode when it is given on the command line
+	"""
+	if len(sys.argv) > 1:
+		print(json.dumps(measure(sys.argv[1])))
+		return
+	
+	files, shared = run("files"), run("shared")
+	report(f"icons from files ({WIDGETS} rows)", files["time"], "ms")
+	report(f"shared icons ({WIDGETS} rows)", shared["time"], "ms")
+	report(f"time saved per {WIDGETS} rows", files["time"] - shared["time"], "ms")
+	report(f"memory, icons from files ({WIDGETS} rows)", files["memory"], "KiB")
+	report(f"memory, shared icons ({WIDGETS} rows)", shared["memory"], "KiB")
+	report(f"memory saved per {WIDGETS} rows", files["memory"] - shared["memory"], "KiB")
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,121 @@
+
+"""
+	Benchmark of the engine import time
+
+- Measures with python -X importtime the import of the headless engine and of its main attributes.
+- Checks that PySide6 is not imported and that the import stays within its budget.
+- Displays the slowest imports of a module :
+	python -m benchmarks.bench_import window.main_window
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.common import report
+
+# Maximum import time of the engine, in milliseconds
+# About 40 ms are measured, most of it by the dataclasses module of the standard library
+IMPORT_BUDGET_MS = 50
+
+# Code run in a new interpreter
+ENGINE_IMPORT = "import engine; engine.Timer, engine.TimerEngine, engine.load_timers, engine.get_notifier"
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+
+def run_importtime(code: str) -> list:
+	""" Runs a code in a new interpreter with -X importtime
+	
+	Returns:
+		- list: (self time, cumulative time, module) of each import, times in microseconds,
+			the module name is indented by its import depth.
+	"""
+	result = subprocess.run(
+		[sys.executable, "-X", "importtime", "-c", code],
+		cwd=SRC_DIR, capture_output=True, text=True, check=True,
+	)
+	
+	imports = []
+	for line in result.stderr.splitlines():
+		if not line.startswith("import time:") or "cumulative" in line:
+			continue
+		own, cumulative, name = line[len("import time:"):].split("|")
+		imports.append((int(own), int(cumulative), name[1:]))
+	
+	return imports
+##
+
+
+def import_time(code: str, repeat: int = 5) -> tuple:
+	""" Measures the imports of a code in a new interpreter
+	
+	- Keeps the best of several runs, the first ones also pay for the bytecode compilation.
+	
+	Returns:
+		- tuple: Cumulative import time in milliseconds, names of the imported modules.
+	"""
+	best = None
+	modules = []
+	
+	for _ in range(repeat):
+		imports = run_importtime(code)
+		modules = [name.strip() for _, _, name in imports]
+		
+		# Top-level imports only, their cumulative time includes their own imports
+		total = sum(cumulative for _, cumulative, name in imports if not name.startswith(" "))
+		
+		if best is None or total < best:
+			best = total
+	
+	return best / 1000, modules
+##
+
+
+def import_report(module: str, count: int = 20):
+	""" Displays the slowest imports of a module, by self time and by cumulative time
+	"""
+	run_importtime(f"import {module}")
+	imports = run_importtime(f"import {module}")
+	
+	for title, key in (("self", 0), ("cumulative", 1)):
+		print(f"Slowest imports of {module}, by {title} time")
+		for own, cumulative, name in sorted(imports, key=lambda entry: entry[key], reverse=True)[:count]:
+			report(name.strip(), (own, cumulative)[key] / 1000, "ms")
+		print()
+##
+
+
+def bench_import(code: str) -> float:
+	""" Imports of a code in a new interpreter, without the interpreter startup, in ms
+	"""
+	baseline, _ = import_time("pass")
+	total, _ = import_time(code)
+	return total - baseline
+
+
+def main():
+	""" Runs the benchmark and checks the budget, or displays the import report of a module
+	"""
+	if len(sys.argv) > 1:
+		import_report(sys.argv[1])
+		return
+	
+
+	# Imports already done by the interpreter at startup are not counted
+	baseline, _ = import_time("pass")
+	total, modules = import_time(ENGINE_IMPORT)
+	
+	report("engine import", total - baseline, "ms")
+	report("engine import budget", IMPORT_BUDGET_MS, "ms")
+	
+	qt_modules = [name for name in modules if name.startswith("PySide6")]
+	if qt_modules:
+		print(f"PySide6 imported by the engine : {', '.join(qt_modules)}")
+	
+	if total - baseline > IMPORT_BUDGET_MS or qt_modules:
+		sys.exit(1)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,93 @@
+
+"""
+	Benchmark of the timer saving
+
+- Compares the bulk saving of save_timers with the previous saving,
+  which inserted the timers one by one in TinyDB.
+- Compares the bytes written by a full save with the journal of a few changes.
+"""
+
+import os
+
+from app.timer.config import get_db_timer
+from app.timer.utils import load_timers, save_timers
+from benchmarks.common import duration, report, temporary_database
+from benchmarks.suite import create_timers
+
+NUMBER_TIMERS = 10_000
+
+# Timers changed between two journal flushes
+NUMBER_CHANGES = 10
+
+# The previous saving rewrites the whole file at each insertion,
+# it is measured on smaller sets and extrapolated
+LEGACY_SIZES = (500, 1000)
+
+
+def legacy_save_timers(timers):
+	""" Previous implementation of save_timers, one TinyDB insertion per timer
+	"""
+	db_timer = get_db_timer()
+	db_timer.truncate()
+	for timer in timers:
+		timer.reset()
+		db_timer.insert(timer.to_record())
+##
+
+
+def main():
+	""" Runs the benchmark and displays the saving times
+	"""
+	
+	# Previous saving, quadratic in the number of timers
+	legacy = {}
+	for size in LEGACY_SIZES:
+		with temporary_database():
+			legacy[size] = duration(legacy_save_timers, create_timers(size))
+		report(f"legacy save_timers ({size} timers)", legacy[size] * 1000, "ms")
+	
+	size = LEGACY_SIZES[-1]
+	estimate = legacy[size] * (NUMBER_TIMERS / size) ** 2
+	report(f"legacy save_timers ({NUMBER_TIMERS} timers, estimated)", estimate * 1000, "ms")
+	
+	# Bulk saving
+	timers = create_timers(NUMBER_TIMERS)
+	with temporary_database():
+		bulk = duration(save_timers, timers)
+		report(f"save_timers ({NUMBER_TIMERS} timers)", bulk * 1000, "ms")
+		
+		# Checks that the saved timers can be read back
+		assert len(load_timers()) == NUMBER_TIMERS
+	
+	report("Speedup (estimated)", estimate / bulk, "x")
+	
+	# Journal of a few changes, the cost no longer depends on the number of timers
+	from app.timer.journal import WriteBehindJournal
+	
+	from app.timer.storage import get_storage
+	
+	with temporary_database():
+		save_timers(timers)
+		path = get_storage().path
+		full_size = sum(os.path.getsize(file) for file in (path, path + "-wal") if os.path.exists(file))
+		
+		journal = WriteBehindJournal()
+		for timer in timers[:NUMBER_CHANGES]:
+			journal.mark(timer)
+		flush = duration(journal.flush)
+		journal.close()
+		
+		report(f"journal flush ({NUMBER_CHANGES} changed timers)", flush * 1000, "ms")
+		report(f"full save size ({NUMBER_TIMERS} timers)", full_size / 1024, "KiB")
+		report(f"journal size ({NUMBER_CHANGES} changed timers)", journal.bytes_written / 1024, "KiB")
+		
+		# Checks that the journal is applied when loading
+		timers[0].title = "Changed"
+		journal = WriteBehindJournal()
+		journal.mark(timers[0])
+		journal.close()
+		assert load_timers()[0].title == "Changed"
+
+
+if __name__ == '__main__':
+	main()
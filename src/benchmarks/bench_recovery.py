@@ -0,0 +1,90 @@
+"""
+	Benchmark of the recovery of running timers
+
+- Saves running timers whose deadlines passed while the application was closed,
+  then measures their loading by load_timers(), which computes the missed rings in one batch.
+- Compares with a replay of the missed rings one by one, as the scheduler would trigger them.
+- Notifications are counted instead of being sent, rings are recorded by the temporary
+  firing recorder of temporary_database(), not by that of the application.
+"""
+
+import time
+
+import app.timer.timer
+from app.timer.config import MAX_RINGS
+from app.timer.timer import Timer
+from app.timer.utils import load_timers
+from app.timer.storage import get_storage
+from benchmarks.common import report, temporary_database
+from benchmarks.suite import create_timers
+
+SIZES = (1000, 10_000)
+
+# Time spent with the application closed, in seconds
+CLOSED = 3600
+
+
+def overdue_records(size: int, now: int) -> list:
+	""" Returns the records of running timers which all ended CLOSED seconds ago
+	"""
+	records = []
+	for timer in create_timers(size):
+		timer.number_rings = MAX_RINGS
+		record = timer.to_record()
+		end_time = now - CLOSED * 1_000_000_000
+		record.update(end_time=end_time, deadline=end_time, rings_left=MAX_RINGS)
+		records.append(record)
+	return records
+
+
+def replay(records: list, now: int):
+	""" Resumes the timers at their deadline, then triggers each missed ring
+	
+	- Like Timer.resume(), the missed rings are not recorded as a scheduling lateness.
+	"""
+	for record in records:
+		record = dict(record)
+		state = {key: record.pop(key) for key in Timer.state}
+		timer = Timer(**record)
+		timer.resume(now=state["deadline"], **state)
+		
+		deadline = state["deadline"]
+		while not timer.end and deadline <= now:
+			timer.ring((now - state["end_time"]) // 1_000_000_000, None)
+			deadline += timer.interval * 1_000_000_000
+
+
+def main():
+	""" Runs the benchmark for each size
+	"""
+	notifications = 0
+	
+	def count(*args):
+		nonlocal notifications
+		notifications += 1
+	
+	app.timer.timer.send_notify = count
+	
+	for size in SIZES:
+		now = time.time_ns()
+		records = overdue_records(size, now)
+		
+		with temporary_database():
+			get_storage().save(records)
+			
+			notifications = 0
+			start = time.perf_counter()
+			timers = load_timers()
+			report(f"load_timers, batch resume ({size} timers)", (time.perf_counter() - start) * 1000, "ms")
+			report(f"notifications, batch resume ({size} timers)", notifications, "notifications")
+			assert all(timer.end for timer in timers)
+			
+			notifications = 0
+			start = time.perf_counter()
+			replay(records, now)
+			report(f"replay of each ring ({size} timers)", (time.perf_counter() - start) * 1000, "ms")
+			report(f"notifications, replay ({size} timers)", notifications, "notifications")
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,89 @@
+"""
+	Benchmark of the display refresh wakeups
+
+- Runs the event loop of the main window with the offscreen Qt platform,
+  and counts the wakeups of the display refresh in each mode : no running timer,
+  hundredths of a second displayed, whole seconds displayed, window hidden to the tray and minimized.
+- The notifications are triggered by the deadline QTimer, which is not counted.
+- The duration of each mode in seconds can be given on the command line.
+"""
+
+import os
+import sys
+import tempfile
+
+from benchmarks.common import report, temporary_database
+
+# Duration of each mode, in seconds
+DURATION = 3
+
+# Number of running timers
+RUNNING = 5
+
+
+def wakeups(view, duration: float) -> float:
+	""" Runs the event loop for duration seconds, returns the refresh wakeups per minute
+	"""
+	from PySide6.QtCore import QEventLoop, QTimer
+	
+	start = view.tick_stats.histogram.count
+	loop = QEventLoop()
+	QTimer.singleShot(int(duration * 1000), loop.quit)
+	loop.exec()
+	return (view.tick_stats.histogram.count - start) / duration * 60
+
+
+def main():
+	""" Runs the benchmark on the main window
+	"""
+	os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+	from PySide6.QtWidgets import QApplication
+	
+	application = QApplication.instance() or QApplication()
+	
+	import utils
+	from app.timer.timer import Timer
+	from window.main_window import MainWindow, InvisibleParent
+	
+	duration = float(sys.argv[1]) if len(sys.argv) > 1 else DURATION
+	
+	with temporary_database(), tempfile.TemporaryDirectory() as folder:
+		utils.config_backup_file = utils.Path(folder) / "config_backup.json"
+		invisible_parent = InvisibleParent()
+		window = MainWindow(invisible_parent)
+		window.show()
+		application.processEvents()
+		view = window.timer_view
+		
+		report("refresh, no running timer", wakeups(view, duration), "wakeups/min")
+		
+		timers = [Timer(f"Timer {i}", "", 3600) for i in range(RUNNING)]
+		for timer in timers:
+			view.add_timer(timer)
+			view.start_timer(timer)
+		
+		window.config["centiseconds"] = True
+		report("refresh, hundredths displayed", wakeups(view, duration), "wakeups/min")
+		
+		window.config["centiseconds"] = False
+		report("refresh, whole seconds displayed", wakeups(view, duration), "wakeups/min")
+		
+		window.config["centiseconds"] = True
+		window.toggle_window()
+		report("refresh, hidden to the tray", wakeups(view, duration), "wakeups/min")
+		
+		window.toggle_window()
+		window.showMinimized()
+		application.processEvents()
+		report("refresh, minimized", wakeups(view, duration), "wakeups/min")
+		
+		window.showNormal()
+		application.processEvents()
+		report("refresh, restored", wakeups(view, duration), "wakeups/min")
+		
+		view.journal.close()
+		Timer.journal = None
+
+
+if __name__ == '__main__':
+	main()
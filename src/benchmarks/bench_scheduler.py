@@ -0,0 +1,78 @@
+
+"""
+	Benchmark of the scheduling backends
+
+- Compares the heap scheduler and the timing wheel for insertion, cancellation and expiration.
+"""
+
+import random
+import time
+
+from app.timer.scheduler import TimerScheduler
+from app.timer.wheel import TimingWheel
+from benchmarks.common import report
+
+NUMBER_TIMERS = 1_000_000
+
+# Deadlines are spread over the maximum time between rings
+HORIZON_NS = 300 * 1_000_000_000
+
+# Period of the expiration checks, like a single-shot QTimer firing every 10 ms
+STEP_NS = 10_000_000
+
+
+class Deadline:
+	""" Minimal timer with a fixed deadline
+	"""
+	__slots__ = ("next_deadline",)
+	
+	def __init__(self, deadline):
+		self.next_deadline = deadline
+##
+
+
+def bench_backend(scheduler, timers, now: int) -> tuple:
+	""" Measures insertion, cancellation and expiration on a scheduler
+	
+	Returns:
+		- tuple: Throughput of each operation in operations per second.
+	"""
+	start = time.perf_counter()
+	for timer in timers:
+		scheduler.schedule(timer)
+	insert = len(timers) / (time.perf_counter() - start)
+	
+	# Cancels half of the timers
+	cancelled = timers[::2]
+	start = time.perf_counter()
+	for timer in cancelled:
+		scheduler.cancel(timer)
+	cancel = len(cancelled) / (time.perf_counter() - start)
+	
+	# Expires the other half, checking the deadlines periodically
+	expired = 0
+	start = time.perf_counter()
+	for current in range(now, now + HORIZON_NS + STEP_NS, STEP_NS):
+		expired += len(scheduler.pop_due(current))
+	expire = expired / (time.perf_counter() - start)
+	
+	return insert, cancel, expire
+##
+
+
+def main():
+	""" Runs the benchmark on both backends and displays the throughputs
+	"""
+	random.seed(0)
+	now = time.monotonic_ns()
+	timers = [Deadline(now + random.randrange(HORIZON_NS)) for _ in range(NUMBER_TIMERS)]
+	
+	for name, scheduler in (("heap", TimerScheduler()), ("wheel", TimingWheel(now=now))):
+		insert, cancel, expire = bench_backend(scheduler, timers, now)
+		report(f"{name} insert ({NUMBER_TIMERS} timers)", insert, "ops/s")
+		report(f"{name} cancel", cancel, "ops/s")
+		report(f"{name} expire", expire, "ops/s")
+
+
+if __name__ == '__main__':
+	main()
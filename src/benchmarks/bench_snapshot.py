@@ -0,0 +1,59 @@
+"""
+	Benchmark of the binary snapshot
+
+- Compares the file size and the loading time of the snapshot with the JSON file of TinyDB.
+- Measures the opening of a snapshot with the decoding of a single record.
+"""
+
+import json
+import os
+
+from app.timer.snapshot import Snapshot
+from app.timer.storage import TinyDBStorage, SnapshotStorage
+from benchmarks.common import duration, report, temporary_database
+from benchmarks.suite import create_timers
+
+SIZES = (1000, 10_000, 100_000)
+
+# Calls of each measure, the shortest one is kept
+REPEAT = 5
+
+
+def load_json(path: str) -> list:
+	""" Parses the JSON file without TinyDB
+	"""
+	with open(path) as f:
+		return list(json.load(f)["_default"].values())
+
+
+def open_snapshot(path: str) -> dict:
+	""" Opens a snapshot and decodes its last record
+	"""
+	with Snapshot(path) as snapshot:
+		return snapshot[-1]
+
+
+def main():
+	""" Runs the benchmark for each size
+	"""
+	for size in SIZES:
+		records = [timer.to_record() for timer in create_timers(size)]
+		
+		with temporary_database():
+			tinydb, snapshot = TinyDBStorage(), SnapshotStorage()
+			tinydb.save(records)
+			snapshot.save(records)
+			assert snapshot.load() == records
+			
+			report(f"JSON size ({size} timers)", os.path.getsize(tinydb.path) / 1024, "KiB")
+			report(f"snapshot size ({size} timers)", os.path.getsize(snapshot.path) / 1024, "KiB")
+			
+			report(f"TinyDB load ({size} timers)", duration(lambda: (tinydb.load(), tinydb.close()), repeat=REPEAT) * 1000, "ms")
+			report(f"json.load ({size} timers)", duration(load_json, tinydb.path, repeat=REPEAT) * 1000, "ms")
+			report(f"snapshot load ({size} timers)", duration(snapshot.load, repeat=REPEAT) * 1000, "ms")
+			report(f"snapshot open + 1 record ({size} timers)",
+				   duration(open_snapshot, snapshot.path, repeat=REPEAT) * 1000, "ms")
+
+
+if __name__ == '__main__':
+	main()
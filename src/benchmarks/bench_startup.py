@@ -0,0 +1,102 @@
+"""
+	Benchmark of the application startup
+
+- Measures the time between the launch of the interpreter and the first paint of the main window,
+  with the offscreen Qt platform.
+- The application data is written to a temporary folder, the first run creates it
+  and the following runs start with existing data, like a normal launch.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import report
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+# Code run in a new interpreter from the project folder, the data folders are redirected
+# before the main window is imported, then the first paint event ends the process
+STARTUP = """
+import os, sys, time
+started = time.perf_counter()
+
+from pathlib import Path
+data = Path(sys.argv[1])
+
+import utils
+utils.data_dir = data
+utils.config_backup_file = data / "config_backup.json"
+
+from app.timer import config
+config.data_dir_timer = str(data / "timer")
+config.db_path = str(data / "timer" / "timers.json")
+config.sqlite_path = str(data / "timer" / "timers.sqlite3")
+config.journal_path = str(data / "timer" / "timers.journal")
+
+from PySide6.QtCore import QEvent, QObject
+from PySide6.QtWidgets import QApplication
+from window.main_window import MainWindow, InvisibleParent
+
+class FirstPaint(QObject):
+	def eventFilter(self, watched, event):
+		if event.type() == QEvent.Paint:
+			print(time.perf_counter() - started, flush=True)
+			os._exit(0)
+		return False
+
+app = QApplication()
+invisible_parent = InvisibleParent()
+window = MainWindow(invisible_parent)
+first_paint = FirstPaint()
+window.installEventFilter(first_paint)
+window.show()
+app.exec()
+"""
+
+
+def first_paint(data: str) -> tuple:
+	""" Launches the application once
+
+	Returns:
+		- tuple: Seconds from the launch of the interpreter and from the first line of the script
+			to the first paint.
+	"""
+	env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPATH=str(SRC_DIR))
+
+	start = time.perf_counter()
+	result = subprocess.run(
+		[sys.executable, "-c", STARTUP, data],
+		cwd=SRC_DIR.parent, env=env, capture_output=True, text=True, check=True,
+	)
+	launch = time.perf_counter() - start
+
+	return launch, float(result.stdout.split()[-1])
+##
+
+
+def measure_startup(repeat: int = 5) -> tuple:
+	""" Returns the best startup times in milliseconds, see first_paint()
+
+	- The first run creates the data and compiles the bytecode, it is not counted.
+	"""
+	with tempfile.TemporaryDirectory() as data:
+		first_paint(data)
+		launches, scripts = zip(*(first_paint(data) for _ in range(repeat)))
+
+	return min(launches) * 1000, min(scripts) * 1000
+
+
+def main():
+	""" Runs the benchmark and displays the startup times
+	"""
+	launch, script = measure_startup()
+	report("startup to first paint", launch, "ms")
+	report("startup to first paint (without interpreter)", script, "ms")
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,63 @@
+"""
+	Benchmark of the timer storage backends
+
+- Compares the loading and saving throughput of TinyDB and SQLite,
+  then the compaction of a few journal entries.
+"""
+
+from app.timer.storage import TinyDBStorage, SQLiteStorage
+from benchmarks.common import duration, report, temporary_database
+from benchmarks.suite import create_timers
+
+SIZES = (1000, 10_000, 100_000)
+
+# Calls of each measure, the shortest one is kept
+REPEAT = 3
+
+# Journal entries applied by the compaction benchmark
+NUMBER_CHANGES = 10
+
+
+def cold_load(factory) -> list:
+	""" Opens a backend, loads the timers and closes it, as at application start
+	"""
+	backend = factory()
+	records = backend.load()
+	backend.close()
+	return records
+
+
+def bench_backend(factory, records: list):
+	""" Measures and displays the throughput of a backend
+	"""
+	name = factory.__name__
+	size = len(records)
+	backend = factory()
+	
+	save = duration(backend.save, records, repeat=REPEAT)
+	report(f"{name}.save ({size} timers)", size / save, "timers/s")
+	
+	load = duration(cold_load, factory, repeat=REPEAT)
+	report(f"{name}.load ({size} timers)", size / load, "timers/s")
+	
+	entries = [dict(record, title="Changed") for record in records[:NUMBER_CHANGES]]
+	apply = duration(backend.apply, entries, repeat=REPEAT)
+	report(f"{name}.apply ({NUMBER_CHANGES} entries)", apply * 1000, "ms")
+	
+	assert len(backend.load()) == size
+	backend.close()
+
+
+def main():
+	""" Runs the benchmark for each size and each backend
+	"""
+	for size in SIZES:
+		records = [timer.to_record() for timer in create_timers(size)]
+		
+		for factory in (TinyDBStorage, SQLiteStorage):
+			with temporary_database():
+				bench_backend(factory, records)
+
+
+if __name__ == '__main__':
+	main()
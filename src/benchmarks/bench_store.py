@@ -0,0 +1,95 @@
+
+"""
+	Benchmark of the timer storage
+
+- Compares the memory used by Timer instances and by a TimerStore.
+"""
+
+import time
+import tracemalloc
+
+from app.timer.store import TimerStore
+from app.timer.timer import Timer
+from benchmarks.common import report
+
+NUMBER_TIMERS = 100_000
+
+
+def allocated(func) -> int:
+	""" Returns the memory allocated by a function that keeps its result alive
+	"""
+	tracemalloc.start()
+	result = func()
+	size, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del result
+	return size
+##
+
+
+def create_timers():
+	""" Creates Timer instances with distinct titles
+	"""
+	return [Timer(f"Timer {i}", "Message", 60 + i % 3600, number_rings=3, interval=15)
+			for i in range(NUMBER_TIMERS)]
+
+
+def create_store():
+	""" Creates a store with the same timers
+	"""
+	store = TimerStore()
+	for i in range(NUMBER_TIMERS):
+		store.append(f"Timer {i}", "Message", 60 + i % 3600, number_rings=3, interval=15)
+	return store
+
+
+def bench_tick() -> tuple:
+	""" Measures the update of all running timers, with a Timer loop and with a batch tick
+	
+	- Timers are started in the past so that a part of them rings during the measurement.
+	
+	Returns:
+		- tuple: Time of a loop over the timers and of a batch tick, in milliseconds.
+	"""
+	timers = create_timers()
+	for timer in timers:
+		timer.start_timer()
+	
+	start = time.perf_counter()
+	for timer in timers:
+		timer.set_timeleft()
+	loop = (time.perf_counter() - start) * 1000
+	
+	store = create_store()
+	now = time.monotonic_ns()
+	for index in range(len(store)):
+		store.start(index, now - index * 10_000_000)
+	
+	# Loads numpy before the measurement
+	import numpy  # noqa: F401
+	
+	start = time.perf_counter()
+	store.tick()
+	batch = (time.perf_counter() - start) * 1000
+	
+	return loop, batch
+##
+
+
+def main():
+	""" Runs the benchmark and displays the memory per timer and the cost of a tick
+	"""
+	timers = allocated(create_timers) / NUMBER_TIMERS
+	store = allocated(create_store) / NUMBER_TIMERS
+	
+	report("Timer instances", timers, "bytes/timer")
+	report("TimerStore", store, "bytes/timer")
+	report("TimerStore without strings", create_store().nbytes / NUMBER_TIMERS, "bytes/timer")
+	
+	loop, batch = bench_tick()
+	report(f"Timer.set_timeleft loop ({NUMBER_TIMERS} timers)", loop, "ms")
+	report(f"TimerStore.tick ({NUMBER_TIMERS} timers)", batch, "ms")
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,76 @@
+"""
+	Benchmark of the theme switching
+
+- Switches the theme of the main window between the QSS files of lib/style, with the offscreen Qt platform.
+- Compares the reading of the file at each switch with the cached and minified stylesheets,
+  whose switch only costs the re-polish of the widgets by Qt.
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.common import report, temporary_database
+
+# Number of switches through all themes
+ROUNDS = 5
+
+
+def read_stylesheet(frame, style_sheet):
+	""" Previous set_stylesheet(), reads the whole file at each call
+	"""
+	with open(style_sheet) as f:
+		frame.setStyleSheet(f.read())
+
+
+def switch(apply, frame, themes: list) -> float:
+	""" Applies every theme ROUNDS times, returns the mean duration of a switch in ms
+	"""
+	start = time.perf_counter()
+	for _ in range(ROUNDS):
+		for theme in themes:
+			apply(frame, theme)
+	return (time.perf_counter() - start) / (ROUNDS * len(themes)) * 1000
+
+
+def main():
+	""" Runs the benchmark on the main window
+	"""
+	os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+	from PySide6.QtWidgets import QApplication
+	
+	application = QApplication.instance() or QApplication()
+	
+	import utils
+	from app.timer.timer import Timer
+	from window.main_window import MainWindow, InvisibleParent
+	
+	themes = sorted(str(path) for path in (utils.lib_dir / "style").glob("*.qss"))
+	
+	with temporary_database(), tempfile.TemporaryDirectory() as folder:
+		utils.config_backup_file = utils.Path(folder) / "config_backup.json"
+		invisible_parent = InvisibleParent()
+		window = MainWindow(invisible_parent)
+		window.show()
+		application.processEvents()
+		
+		report("theme switch, file read", switch(read_stylesheet, window, themes), "ms")
+		
+		utils._stylesheets.clear()
+		start = time.perf_counter()
+		for theme in themes:
+			utils.load_stylesheet(theme)
+		report("theme cache, first load of all themes", (time.perf_counter() - start) * 1000, "ms")
+		
+		report("theme switch, cached", switch(utils.set_stylesheet, window, themes), "ms")
+		
+		# Re-polish alone, measured by set_stylesheet()
+		polish = [utils.set_stylesheet(window, theme) for theme in themes]
+		report("theme switch, Qt re-polish", sum(polish) / len(polish) * 1000, "ms")
+		
+		window.timer_view.journal.close()
+		Timer.journal = None
+
+
+if __name__ == '__main__':
+	main()
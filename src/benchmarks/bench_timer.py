@@ -0,0 +1,36 @@
+
+"""
+	Benchmark of the Timer update
+
+- Compares the per-tick cost of Timer.set_timeleft with the wall and monotonic clocks.
+"""
+
+from app.timer.timer import Timer
+from benchmarks.common import measure, report
+
+
+def bench_set_timeleft(clock: str) -> float:
+	""" Measures a tick of a running timer with the requested clock
+	
+	- The timer lasts one hour so that no notification is triggered during the measurement.
+	"""
+	timer = Timer("Benchmark", "", 3600)
+	timer.clock = clock
+	timer.start_timer()
+	return measure(timer.set_timeleft, number=100_000)
+##
+
+
+def main():
+	""" Runs the benchmark and displays the results
+	"""
+	wall = bench_set_timeleft("wall")
+	monotonic = bench_set_timeleft("monotonic")
+	
+	report("Timer.set_timeleft (wall)", wall)
+	report("Timer.set_timeleft (monotonic)", monotonic)
+	report("Speedup", wall / monotonic, "x")
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,119 @@
+"""
+	Benchmark of the timer list
+
+- Fills the timer view with many timers, with the offscreen Qt platform,
+  and measures the memory used per timer and the time to build the list.
+- Measures the time of a frame : refresh of the running timers and repaint of the visible rows.
+- Measures a frame following another one in the same hundredth of a second,
+  whose rows are skipped by the render cache, and counts the repaints requested and skipped.
+"""
+
+import gc
+import os
+import sys
+import time
+
+from benchmarks.common import report, temporary_database
+
+SIZES = (1000, 10_000)
+
+# Number of running timers during the frame measurement
+RUNNING = 200
+
+
+def resident_memory() -> int:
+	""" Returns the resident memory of the process in bytes, Qt allocations included
+	"""
+	with open("/proc/self/statm") as f:
+		return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure_view(size: int) -> tuple:
+	""" Builds a view with size timers
+	
+	Returns:
+		- tuple: Build time in ms, memory per timer in KiB, frame time in ms,
+		  time of an unchanged frame in ms, render counters.
+	"""
+	from PySide6.QtWidgets import QApplication
+	from app.timer.timer import Timer
+	from app.timer.timer_view import TimerView
+	
+	application = QApplication.instance()
+	
+	with temporary_database():
+		view = TimerView()
+		view.resize(500, 600)
+		view.show()
+		application.processEvents()
+		
+		gc.collect()
+		memory = resident_memory()
+		start = time.perf_counter()
+		
+		timers = [Timer(f"Timer {i}", "Message", 3600) for i in range(size)]
+		for timer in timers:
+			view.add_timer(timer)
+		application.processEvents()
+		
+		build = time.perf_counter() - start
+		gc.collect()
+		memory = resident_memory() - memory
+		
+		for timer in timers[:RUNNING]:
+			view.start_timer(timer)
+		view.lst_timer.viewport().repaint()
+		
+		render_cache = view.delegate.render_cache
+		render_cache.renders = render_cache.skipped = 0
+		
+		def measure_frame() -> float:
+			start = time.perf_counter()
+			view.check_timer()
+			application.processEvents()  # Paints the updated rows only
+			return time.perf_counter() - start
+		
+		# The displayed remaining times change between two frames 10 ms apart,
+		# not between two consecutive frames
+		frame = unchanged = float("inf")
+		for _ in range(20):
+			time.sleep(0.01)
+			frame = min(frame, measure_frame())
+			unchanged = min(unchanged, measure_frame())
+		
+		counters = render_cache.counters()
+		
+		view.timer_refresh.stop()
+		view.timer_deadline.stop()
+		view.journal.close()
+		Timer.journal = None
+		view.deleteLater()
+		application.processEvents()
+	
+	return build * 1000, memory / size / 1024, frame * 1000, unchanged * 1000, counters
+
+
+def main():
+	""" Runs the benchmark for each size
+	
+	- The memory is only meaningful for the first size measured in a process,
+	  a size can be given on the command line.
+	"""
+	os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+	from PySide6.QtWidgets import QApplication
+	
+	application = QApplication.instance() or QApplication()
+	
+	sizes = [int(size) for size in sys.argv[1:]] or SIZES
+	for size in sizes:
+		build, memory, frame, unchanged, counters = measure_view(size)
+		report(f"timer list build ({size} timers)", build, "ms")
+		report(f"memory per timer ({size} timers)", memory, "KiB")
+		report(f"frame, {RUNNING} running ({size} timers)", frame, "ms")
+		report(f"frame without change, {RUNNING} running ({size} timers)", unchanged, "ms")
+		report(f"row repaints, {RUNNING} running ({size} timers)", counters["renders"], "rows")
+		report(f"row repaints skipped, {RUNNING} running ({size} timers)", counters["skipped"], "rows")
+
+
+if __name__ == '__main__':
+	main()
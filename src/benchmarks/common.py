@@ -0,0 +1,87 @@
+
+"""
+	Functions shared by the benchmarks
+"""
+
+import contextlib
+import os
+import tempfile
+import time
+import timeit
+
+
+def measure(func, number: int = 10_000, repeat: int = 5) -> float:
+	""" Measures the cost of a function call
+	
+	- Keeps the best of several repetitions to limit the noise of the system.
+	
+	Args:
+		- func (callable): Function to measure, called without arguments.
+		- number (int): Number of calls per repetition.
+		- repeat (int): Number of repetitions.
+	
+	Returns:
+		- float: Cost of a call in nanoseconds.
+	"""
+	timings = timeit.repeat(func, number=number, repeat=repeat)
+	return min(timings) / number * 1e9
+
+
+#
+def duration(func, *args, repeat: int = 1) -> float:
+	""" Measures the duration of a single call, for operations too long to be repeated by measure()
+	
+	Args:
+		- func (callable): Function to measure, called with args.
+		- repeat (int): Number of calls, the shortest one is kept.
+	
+	Returns:
+		- float: Duration of a call in seconds.
+	"""
+	best = None
+	for _ in range(repeat):
+		start = time.perf_counter()
+		func(*args)
+		elapsed = time.perf_counter() - start
+		best = elapsed if best is None else min(best, elapsed)
+	return best
+##
+
+
+#
+def report(name: str, value: float, unit: str = "ns/call"):
+	""" Displays the result of a benchmark
+	"""
+	print(f"{name:<45} {value:>12.1f} {unit}")
+
+
+#
+@contextlib.contextmanager
+def temporary_database():
+	""" Uses a temporary timer database, journal and firing recorder during a benchmark
+	
+	- The application database and firing statistics are left untouched.
+	"""
+	from app.timer import config
+	
+	from app.timer import metrics, storage
+	
+	previous = (config.db_path, config.sqlite_path, config.snapshot_path, config.journal_path,
+				config.FIRING_STATS_PATH, config._db_timer, storage._storage, metrics._recorder)
+	with tempfile.TemporaryDirectory() as folder:
+		config.db_path = os.path.join(folder, "timers.json")
+		config.sqlite_path = os.path.join(folder, "timers.sqlite3")
+		config.snapshot_path = os.path.join(folder, "timers.snapshot")
+		config.journal_path = os.path.join(folder, "timers.journal")
+		config.FIRING_STATS_PATH = os.path.join(folder, "firing_stats.json")
+		config._db_timer = storage._storage = None
+		
+		# Rings of the benchmark are recorded apart from those of the application, and never written
+		metrics._recorder = metrics.FiringRecorder()
+		try:
+			yield folder
+		finally:
+			storage.close_storage()
+			config.close_db_timer()
+			(config.db_path, config.sqlite_path, config.snapshot_path, config.journal_path,
+			 config.FIRING_STATS_PATH, config._db_timer, storage._storage, metrics._recorder) = previous
@@ -0,0 +1,203 @@
+
+"""
+	Benchmark suite of the timer hot paths
+
+- Each benchmark returns the cost of an operation, lower is better.
+- Used by the benchmarks command line, see benchmarks/__main__.py.
+"""
+
+import os
+from datetime import timedelta
+
+from benchmarks.bench_import import ENGINE_IMPORT
+from benchmarks.common import measure, temporary_database
+
+# Number of timers of the persistence and view benchmarks
+NUMBER_TIMERS = 1000
+
+# Number of running timers of the view benchmark
+NUMBER_RUNNING = 200
+
+# Running timers among idle ones, a tick should only cost the running ones
+NUMBER_ACTIVE = 5
+
+# Long list of running timers, a tick should only cost the displayed ones
+NUMBER_LONG = 5000
+
+
+def create_timers(number: int) -> list:
+	""" Creates timers with distinct titles
+	"""
+	from app.timer.timer import Timer
+	return [Timer(f"Timer {i}", "Message", 60 + i % 3600, number_rings=3, interval=15) for i in range(number)]
+##
+
+
+#
+def bench_set_timeleft(clock: str) -> float:
+	""" Tick of a running timer, in ns/call
+	"""
+	from app.timer.timer import Timer
+	
+	timer = Timer("Benchmark", "", 3600)
+	timer.clock = clock
+	timer.start_timer()
+	return measure(timer.set_timeleft, number=100_000)
+
+
+#
+def bench_format_duration(value) -> float:
+	""" Formatting of a duration, in ns/call
+	"""
+	from app.timer.duration import format_duration
+	return measure(lambda: format_duration(value), number=100_000)
+
+
+#
+def bench_split_duration() -> float:
+	""" Hours, minutes and seconds of a timer, as read by the modification form, in ns/call
+	"""
+	from app.timer.timer import Timer
+	
+	timer = Timer("Benchmark", "", 3725)
+	return measure(lambda: (timer.hours, timer.minutes, timer.seconds), number=100_000)
+##
+
+
+#
+def bench_load_timers() -> float:
+	""" Loading of NUMBER_TIMERS timers from the database, in ns/call
+	"""
+	from app.timer.utils import load_timers, save_timers
+	
+	with temporary_database():
+		save_timers(create_timers(NUMBER_TIMERS))
+		return measure(load_timers, number=1, repeat=5)
+
+
+#
+def bench_save_timers() -> float:
+	""" Saving of NUMBER_TIMERS timers in the database, in ns/call
+	"""
+	from app.timer.utils import save_timers
+	
+	timers = create_timers(NUMBER_TIMERS)
+	with temporary_database():
+		return measure(lambda: save_timers(timers), number=1, repeat=3)
+
+
+#
+def bench_journal_flush(changed: int) -> float:
+	""" Writing of the changed timers among NUMBER_TIMERS to the journal, in ns/call
+	"""
+	from app.timer.journal import WriteBehindJournal
+	
+	timers = create_timers(NUMBER_TIMERS)[:changed]
+	with temporary_database():
+		journal = WriteBehindJournal()
+		
+		def flush():
+			for timer in timers:
+				journal.mark(timer)
+			journal.flush()
+		
+		cost = measure(flush, number=100, repeat=5)
+		journal.close()
+	
+	return cost
+
+
+#
+def bench_check_timer(running: int, idle: int = 0) -> float:
+	""" Refresh of the timer view with running and idle timers, in ns/call
+	
+	- Uses the offscreen Qt platform, the view is shown in a window of 500x600 pixels.
+	"""
+	os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+	from PySide6.QtWidgets import QApplication
+	
+	application = QApplication.instance() or QApplication()
+	
+	from app.timer.timer_view import TimerView
+	from app.timer.timer import Timer
+	
+	with temporary_database():
+		view = TimerView()
+		view.resize(500, 600)
+		view.show()
+		
+		# Replaces the default timers with long running timers
+		view.model.removeRows(0, view.model.rowCount())
+		for i in range(running + idle):
+			timer = Timer(f"Timer {i}", "", 3600)
+			view.add_timer(timer)
+			if i < running:
+				view.start_timer(timer)
+		application.processEvents()
+		
+		cost = measure(view.check_timer, number=100, repeat=5)
+		
+		view.timer_refresh.stop()
+		view.timer_deadline.stop()
+		view.journal.close()
+		Timer.journal = None
+		view.deleteLater()
+		application.processEvents()
+	
+	return cost
+##
+
+
+#
+def bench_load_stylesheet() -> float:
+	""" Loading of a cached theme, in ns/call
+	"""
+	import utils
+	
+	style_sheet = utils.lib_dir / "style" / "Combinear.qss"
+	utils.load_stylesheet(style_sheet)
+	return measure(lambda: utils.load_stylesheet(style_sheet), number=10_000)
+##
+
+
+#
+def bench_import(code: str) -> float:
+	""" Imports of a code in a new interpreter, in ms
+	"""
+	from benchmarks.bench_import import bench_import
+	return bench_import(code)
+
+
+#
+def bench_startup() -> float:
+	""" Launch of the application until the first paint of the main window, in ms
+	"""
+	from benchmarks.bench_startup import measure_startup
+	return measure_startup()[0]
+##
+
+
+# Benchmarks of the suite, name: (function, unit)
+BENCHMARKS = {
+	"timer.set_timeleft[monotonic]": (lambda: bench_set_timeleft("monotonic"), "ns/call"),
+	"timer.set_timeleft[wall]": (lambda: bench_set_timeleft("wall"), "ns/call"),
+	"format_duration[int]": (lambda: bench_format_duration(3725), "ns/call"),
+	"format_duration[int, beyond a day]": (lambda: bench_format_duration(100_000), "ns/call"),
+	"format_duration[float]": (lambda: bench_format_duration(3725.25), "ns/call"),
+	"format_duration[float, sub-second]": (lambda: bench_format_duration(0.25), "ns/call"),
+	"format_duration[timedelta]": (lambda: bench_format_duration(timedelta(seconds=-3725.25)), "ns/call"),
+	"timer.hours+minutes+seconds": (bench_split_duration, "ns/call"),
+	f"load_timers[{NUMBER_TIMERS}]": (bench_load_timers, "ns/call"),
+	f"save_timers[{NUMBER_TIMERS}]": (bench_save_timers, "ns/call"),
+	f"journal.flush[10/{NUMBER_TIMERS}]": (lambda: bench_journal_flush(10), "ns/call"),
+	f"timer_view.check_timer[{NUMBER_RUNNING}]": (lambda: bench_check_timer(NUMBER_RUNNING), "ns/call"),
+	f"timer_view.check_timer[{NUMBER_ACTIVE}]": (lambda: bench_check_timer(NUMBER_ACTIVE), "ns/call"),
+	f"timer_view.check_timer[{NUMBER_ACTIVE}+{NUMBER_TIMERS} idle]":
+		(lambda: bench_check_timer(NUMBER_ACTIVE, NUMBER_TIMERS), "ns/call"),
+	f"timer_view.check_timer[{NUMBER_LONG}]": (lambda: bench_check_timer(NUMBER_LONG), "ns/call"),
+	"stylesheet.load[cached]": (bench_load_stylesheet, "ns/call"),
+	"import[engine]": (lambda: bench_import(ENGINE_IMPORT), "ms"),
+	"import[app.timer.timer]": (lambda: bench_import("import app.timer.timer"), "ms"),
+	"import[window.main_window]": (lambda: bench_import("import window.main_window"), "ms"),
+	"startup.first_paint": (bench_startup, "ms"),
+}
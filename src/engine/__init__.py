@@ -0,0 +1,52 @@
+
+"""
+    $ -- Timer engine -- $
+Headless timer engine, usable without the graphical interface.
+
+- Gives access to the timers, their scheduling, their persistence and their notifications
+  without importing PySide6.
+- Attributes are imported on first access, importing the package itself costs almost nothing.
+
+Example:
+	>>> import engine
+	>>> timer_engine = engine.TimerEngine(engine.load_timers())
+	>>> timer_engine.start_thread()
+"""
+
+import importlib
+
+# Module providing each attribute of the package
+_ATTRIBUTES = {
+	"Timer": "app.timer.timer",
+	"format_duration": "app.timer.duration",
+	"TimerScheduler": "app.timer.scheduler",
+	"create_scheduler": "app.timer.scheduler",
+	"TimingWheel": "app.timer.wheel",
+	"TimerStore": "app.timer.store",
+	"load_timers": "app.timer.utils",
+	"save_timers": "app.timer.utils",
+	"get_storage": "app.timer.storage",
+	"export_json": "app.timer.storage",
+	"NotificationDispatcher": "app.timer.notifier",
+	"NotificationCoalescer": "app.timer.notifier",
+	"get_notifier": "app.timer.notifier",
+	"get_recorder": "app.timer.metrics",
+	"TimerEngine": "engine.runner",
+}
+
+__all__ = list(_ATTRIBUTES)
+
+
+def __getattr__(name):
+	""" Imports an attribute of the package on first access
+	"""
+	if name not in _ATTRIBUTES:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	
+	value = getattr(importlib.import_module(_ATTRIBUTES[name]), name)
+	globals()[name] = value
+	return value
+
+
+def __dir__():
+	return __all__
@@ -0,0 +1,138 @@
+
+"""
+    $ -- TimerEngine -- $
+Runs timers without the graphical interface.
+"""
+
+import threading
+
+from app.timer.scheduler import create_scheduler
+
+
+class TimerEngine:
+	""" Headless equivalent of the timer view
+	
+	- Keeps a list of timers and schedules the running ones.
+	- A loop, run in the calling thread or in a background thread, sleeps until the next deadline
+	  and updates the due timers, which trigger their notifications.
+	- Methods can be called from any thread.
+	"""
+	
+	def __init__(self, timers=(), scheduler=None):
+		self.timers = list(timers)
+		self.scheduler = scheduler if scheduler is not None else create_scheduler()
+		
+		# Wakes the loop up when the deadlines change
+		self._condition = threading.Condition()
+		self._stopped = False
+		self._thread = None
+		
+		# Timers already running, for example after loading
+		for timer in self.timers:
+			self.scheduler.schedule(timer)
+	##
+	
+	#
+	def add(self, timer):
+		""" Adds a timer to the engine
+		"""
+		with self._condition:
+			self.timers.append(timer)
+			self.scheduler.schedule(timer)
+			self._condition.notify()
+	
+	#
+	def remove(self, timer):
+		""" Removes a timer from the engine
+		"""
+		with self._condition:
+			self.timers.remove(timer)
+			self.scheduler.cancel(timer)
+			self._condition.notify()
+	
+	#
+	def start(self, timer):
+		""" Starts or pauses a timer, like the play button
+		"""
+		with self._condition:
+			timer.start_timer()
+			self.scheduler.schedule(timer)
+			self._condition.notify()
+	
+	#
+	def stop(self, timer):
+		""" Stops a timer
+		"""
+		with self._condition:
+			timer.stop_timer()
+			self.scheduler.schedule(timer)
+			self._condition.notify()
+	
+	#
+	def reset(self, timer):
+		""" Resets a timer to its default duration
+		"""
+		with self._condition:
+			timer.reset()
+			self.scheduler.schedule(timer)
+			self._condition.notify()
+	##
+	
+	#
+	def run_pending(self, now: int | None = None) -> list:
+		""" Updates the timers whose deadline has passed
+		
+		- Due timers trigger their notifications and are rescheduled on their next deadline.
+		
+		Returns:
+			- list: Updated timers.
+		"""
+		with self._condition:
+			due = self.scheduler.pop_due(now)
+			for timer in due:
+				timer.set_timeleft()
+				self.scheduler.schedule(timer)
+		return due
+	##
+	
+	#
+	def run(self):
+		""" Runs the engine until shutdown() is called
+		
+		- Sleeps until the earliest deadline, or until the deadlines change.
+		"""
+		while True:
+			with self._condition:
+				if self._stopped:
+					return
+				
+				timeout = self.scheduler.timeout()
+				if timeout is None or timeout > 0:
+					self._condition.wait(None if timeout is None else timeout / 1000)
+					continue
+			
+			self.run_pending()
+	##
+	
+	#
+	def start_thread(self) -> threading.Thread:
+		""" Runs the engine in a background thread
+		"""
+		self._stopped = False
+		self._thread = threading.Thread(target=self.run, name="timer-engine", daemon=True)
+		self._thread.start()
+		return self._thread
+	
+	#
+	def shutdown(self):
+		""" Stops the engine loop and waits for the background thread
+		"""
+		with self._condition:
+			self._stopped = True
+			self._condition.notify()
+		
+		if self._thread is not None:
+			self._thread.join()
+			self._thread = None
+	##
+##
@@ -2,6 +2,13 @@
 
 """ Entry point for the application """
 
+from settings import THEME_WARMUP
+from utils import get_config_store, load_icons, warm_stylesheet
+
+# The selected theme is read while Qt and the interface are loading
+if __name__ == '__main__' and THEME_WARMUP:
+	warm_stylesheet(f"lib/style/{get_config_store()['style']}.qss")
+
 from PySide6.QtWidgets import QApplication
 
 from window.main_window import MainWindow, InvisibleParent
@@ -10,6 +17,9 @@ from window.main_window import MainWindow, InvisibleParent
 if __name__ == '__main__':
 	app = QApplication()
 	
+	# Icons are decoded once, before the widgets share them
+	load_icons()
+	
 	invisible_parent = InvisibleParent()
 	window = MainWindow(invisible_parent)
 	window.show()
@@ -10,3 +10,7 @@ CONSOLE_DEBUG = True
 # Program debug level
 # - None: no debugging
 LOG = None
+
+# Loads the selected theme in the background at startup,
+# while the interface is being created.
+THEME_WARMUP = True
@@ -1,10 +1,10 @@
 
 """ Utils.py / Contains the project's utility functions. """
 
-from tinydb import TinyDB
-
 from pathlib import Path
 import logging
+import threading
+import time
 
 from settings import CONSOLE_DEBUG, LOG
 
@@ -21,14 +21,55 @@ PROJECT_NAME = PROJECT_PATH[PROJECT_PATH.rfind("\\") + 1:]
 # Project folder path
 CUR_DIR = Path(__file__).resolve().parent.parent
 
+# Project folders, created on first use by get_lib_dir() and get_data_dir()
 lib_dir = CUR_DIR / "lib"
-lib_dir.mkdir(exist_ok=True)
-
-# Creates a data folder if it doesn't exist
 data_dir = CUR_DIR / "data"
-data_dir.mkdir(exist_ok=True)
 config_backup_file = data_dir / "config_backup.json"
 
+# Folders already created, so that each folder costs a single mkdir
+_created_dirs = set()
+
+
+def _create_dir(path: Path) -> Path:
+	""" Creates a folder if it doesn't exist, only once per folder """
+	if path not in _created_dirs:
+		path.mkdir(exist_ok=True)
+		_created_dirs.add(path)
+	return path
+
+
+def write_bytes_atomic(path, data: bytes):
+	""" Writes a file in a single atomic operation
+	
+	- Data is written to a temporary file in the same folder, which then replaces the file.
+	- The file is either the previous one or the new one, never a partially written one.
+	- The folder must exist.
+	"""
+	import os
+	import tempfile
+	
+	folder = os.path.dirname(path)
+	descriptor, temp_path = tempfile.mkstemp(dir=folder, prefix=".tmp_", suffix=os.path.splitext(path)[1])
+	try:
+		with os.fdopen(descriptor, "wb") as f:
+			f.write(data)
+			f.flush()
+			os.fsync(f.fileno())
+		os.replace(temp_path, path)
+	except BaseException:
+		os.remove(temp_path)
+		raise
+
+
+def get_lib_dir() -> Path:
+	""" Returns the lib folder, created on first use """
+	return _create_dir(lib_dir)
+
+
+def get_data_dir() -> Path:
+	""" Returns the data folder, created on first use """
+	return _create_dir(data_dir)
+
 
 def check_work_path():
 	""" Check application location to differentiate icons.
@@ -45,7 +86,9 @@ def check_work_path():
 
 def get_db():
 	""" Recovers the database. """
-	file = data_dir / "data.json"
+	from tinydb import TinyDB
+	
+	file = get_data_dir() / "data.json"
 	if not file.exists():
 		file.touch()
 	db = TinyDB(file, indent=4)
@@ -61,61 +104,299 @@ base_config = {
 	"geoy": 100,
 	"geow": 0,
 	"geoh": 288,
+	"centiseconds": True,
 }
 
 
+class ConfigStore:
+	""" Application options, kept in memory
+	
+	- The config_backup file is read once, then options are read from memory.
+	- The options are validated against base_config in a single pass,
+	  missing keys and values of the wrong type are replaced by the base value.
+	- The file is written atomically, and only when an option has changed.
+	- Subscribers are called with the key and the new value of each changed option.
+	"""
+	
+	def __init__(self, path: Path | None = None, defaults: dict | None = None):
+		self._path = path
+		self.defaults = base_config if defaults is None else defaults
+		self._config = None
+		self._dirty = False
+		self._subscribers = []
+	
+	@property
+	def path(self) -> Path:
+		""" File of the options, config_backup_file by default """
+		return self._path or config_backup_file
+	
+	def load(self) -> dict:
+		""" Reads and validates the file, once
+		
+		- An absent or unreadable file is replaced by the base config.
+		- The file is rewritten once if the validation changed it.
+		"""
+		if self._config is not None:
+			return self._config
+		
+		import json
+		try:
+			with open(self.path) as f:
+				stored = json.load(f)
+			if not isinstance(stored, dict):
+				raise ValueError("the options are not a JSON object")
+		except FileNotFoundError:
+			stored = {}
+		except (OSError, ValueError) as e:
+			dbg(f"Error reading config file: {e}")
+			stored = {}
+		
+		self._config, self._dirty = self.validate(stored)
+		self.save()
+		return self._config
+	
+	def validate(self, stored: dict) -> tuple:
+		""" Completes the stored options with the base config
+		
+		Returns:
+			- tuple: Valid options, True if they differ from the stored ones.
+		"""
+		config = dict(stored)
+		changed = not stored
+		for key, default in self.defaults.items():
+			value = config.get(key)
+			if type(value) is not type(default):
+				config[key] = default
+				changed = True
+		return config, changed
+	
+	def __getitem__(self, key: str):
+		return self.load()[key]
+	
+	def __setitem__(self, key: str, value):
+		self.update({key: value})
+	
+	def __contains__(self, key: str) -> bool:
+		return key in self.load()
+	
+	def get(self, key: str, default=None):
+		return self.load().get(key, default)
+	
+	def as_dict(self) -> dict:
+		""" Returns a copy of the options """
+		return dict(self.load())
+	
+	def update(self, values: dict):
+		""" Changes options, subscribers are only notified of the values that differ """
+		config = self.load()
+		changed = {key: value for key, value in values.items() if config.get(key) != value or key not in config}
+		if not changed:
+			return
+		
+		config.update(changed)
+		self._dirty = True
+		for key, value in changed.items():
+			for callback in list(self._subscribers):
+				callback(key, value)
+	
+	def subscribe(self, callback):
+		""" Calls callback(key, value) when an option changes """
+		self._subscribers.append(callback)
+	
+	def unsubscribe(self, callback):
+		""" Stops calling a subscriber """
+		if callback in self._subscribers:
+			self._subscribers.remove(callback)
+	
+	def save(self) -> bool:
+		""" Writes the options if they have changed since the last write
+		
+		- The options are written to a temporary file which then replaces the file,
+		  the file is either the previous one or the new one.
+		
+		Returns:
+			- bool: True if the file was written.
+		"""
+		if not self._dirty:
+			return False
+		
+		import json
+		
+		try:
+			_create_dir(self.path.parent)
+			write_bytes_atomic(self.path, json.dumps(self._config, indent=4).encode())
+		except IOError as e:
+			print(f"Error writing config file: {e}")
+			return False
+		
+		self._dirty = False
+		return True
+
+
+# Options shared by the application, read on first use
+_config_store = None
+
+
+def get_config_store() -> ConfigStore:
+	""" Returns the application options """
+	global _config_store
+	if _config_store is None:
+		_config_store = ConfigStore()
+	return _config_store
+
+
 def check_config_backup():
 	""" **Checks the configuration file.**.
 
 	- Creates the config file if it doesn't exist.
 	- Checks that the config file contains the expected keys by comparing it with the base config.
-	- Adds and saves missing keys to the file for the application.
+	- Adds missing keys and saves the file once for the application.
 
 	:returns:"""
-	import json
-	
-	# Creates config_backup file if none exists
-	if not config_backup_file.exists():
-		with open(config_backup_file, "w") as f:
-			json.dump(base_config, f, indent=4)
-	
-	# Checks that the config_backup file contains the expected keys
-	with open(config_backup_file) as f:
-		config = json.load(f)
-		for key in base_config.keys():
-			if key not in config:
-				config[key] = base_config[key]
-				save_config_backup(config)
+	get_config_store().load()
 
 
 def get_config_backup():
-	""" Loads and returns options from the config_backup file """
-	import json
-	try:
-		with open(config_backup_file) as f:
-			return json.load(f)
-	except IOError as e:
-		print(f"Error reading config file: {e}")
-		return base_config
+	""" Returns a copy of the options, without reading the config_backup file again """
+	return get_config_store().as_dict()
 
 
 def save_config_backup(config: dict):
-	""" Saves options in config_backup file """
-	import json
+	""" Saves options in config_backup file, only if they have changed """
+	store = get_config_store()
+	store.update(config)
+	store.save()
+
+
+# Stylesheets already read, by path : (modification time, minified content)
+_stylesheets = {}
+_stylesheets_lock = threading.Lock()
+
+
+def minify_stylesheet(style: str) -> str:
+	""" Removes the comments and the spaces that Qt does not need from a stylesheet """
+	import re
+	
+	style = re.sub(r"/\*.*?\*/", "", style, flags=re.DOTALL)
+	style = re.sub(r"\s+", " ", style)
+	style = re.sub(r"\s*([{};,>])\s*", r"\1", style)
+	style = re.sub(r":\s+", ":", style)
+	return style.replace(";}", "}").strip()
+
+
+def load_stylesheet(style_sheet) -> str | None:
+	""" Returns the minified content of a stylesheet file
+	
+	- The file is read and minified once, then kept in memory
+	  until its modification time changes.
+	- Returns None if the file doesn't exist.
+	"""
+	import os
+	
+	# Paths are compared as strings, cheaper to hash than Path objects
+	qss_path = os.fspath(style_sheet)
 	try:
-		with open(config_backup_file, "w") as f:
-			json.dump(config, f, indent=4)
-	except IOError as e:
-		print(f"Error writing config file: {e}")
+		mtime = os.stat(qss_path).st_mtime_ns
+	except OSError:
+		return None
+	
+	# The lock makes a call wait for the warm-up of the same file instead of reading it again
+	with _stylesheets_lock:
+		cached = _stylesheets.get(qss_path)
+		if cached is None or cached[0] != mtime:
+			with open(qss_path) as f:
+				cached = _stylesheets[qss_path] = mtime, minify_stylesheet(f.read())
+	
+	return cached[1]
+
+
+def warm_stylesheet(style_sheet):
+	""" Loads a stylesheet in a background thread
+	> At startup, before the main window applies its theme
+	"""
+	threading.Thread(target=load_stylesheet, args=(style_sheet,), daemon=True).start()
 
 
 def set_stylesheet(frame, style_sheet):
-	""" Load stylesheet content from file """
-	qss_path = Path(style_sheet)
-	if qss_path.exists():
-		with open(qss_path) as f:
-			style = f.read()
-			frame.setStyleSheet(style)
+	""" Applies a stylesheet file to a widget
+	
+	- The file content comes from the cache of load_stylesheet().
+	- The time Qt takes to re-polish the widgets is displayed in debug.
+	
+	:returns: Re-polish time in seconds, None if the file doesn't exist
+	"""
+	style = load_stylesheet(style_sheet)
+	if style is None:
+		return None
+	
+	start = time.perf_counter()
+	frame.setStyleSheet(style)
+	elapsed = time.perf_counter() - start
+	
+	dbg(f"Stylesheet {Path(style_sheet).stem} applied in {elapsed * 1000:.1f} ms")
+	return elapsed
+
+
+# Icons of the application by name, absolute paths so that they don't depend on the working directory
+icons_dir = lib_dir / "icons"
+timer_icons_dir = CUR_DIR / "src" / "app" / "timer" / "icons"
+ICONS = {
+	"main": icons_dir / "main_icon.png",
+	"work": icons_dir / "main_icon.png",  # No work icon is shipped, the work installation uses the main icon
+	"options": icons_dir / "opt.png",
+	"play": timer_icons_dir / "icon_play.png",
+	"break": timer_icons_dir / "icon_break.png",
+	"reset": timer_icons_dir / "icon_reset.png",
+	"modify": timer_icons_dir / "icon_modify.png",
+}
+
+# Icon replacing those whose file is missing
+FALLBACK_ICON = "main"
+
+# Icons already decoded, by name, shared by all widgets
+_icons = {}
+
+
+def check_icons() -> list:
+	""" Returns the names of the icons whose file is missing """
+	return [name for name, path in ICONS.items() if not path.is_file()]
+
+
+def get_icon(name: str):
+	""" Returns an icon of the application
+	
+	- The file is decoded once, the QIcon is then shared by all widgets.
+	- An icon whose file is missing is replaced by FALLBACK_ICON, missing files are reported by load_icons().
+	- Requires the QApplication.
+	"""
+	icon = _icons.get(name)
+	if icon is None:
+		from PySide6.QtGui import QIcon, QPixmap
+		
+		path = ICONS[name]
+		if path.is_file():
+			icon = QIcon(QPixmap(str(path)))
+		elif name != FALLBACK_ICON:
+			icon = get_icon(FALLBACK_ICON)
+		else:
+			icon = QIcon()
+		_icons[name] = icon
+	return icon
+
+
+def load_icons():
+	""" Decodes all the icons of the application
+	> At startup, once the QApplication is created
+	
+	- The icons whose file is missing are reported once as a warning.
+	"""
+	missing = check_icons()
+	if missing:
+		logging.warning("Icons not found, replaced by the %s icon : %s", FALLBACK_ICON,
+						", ".join(f"{name} ({ICONS[name]})" for name in missing))
+	
+	for name in ICONS:
+		get_icon(name)
 
 
 def create_log_file():
@@ -149,7 +430,7 @@ def config_log(filepath, level, date: bool = False):
 	""" Configures the log file """
 	
 	if date:
-		form = f"{"-" * 30}" + "\n%(asctime)s : %(levelname)s : \n%(message)s\n"
+		form = "-" * 30 + "\n%(asctime)s : %(levelname)s : \n%(message)s\n"
 	else:
 		form = " %(levelname)s : %(message)s\n" + f"{'-' * 30}"
 	
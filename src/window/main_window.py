@@ -2,19 +2,17 @@
 
 """ Main window of the application """
 
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon
+from PySide6.QtCore import QEvent, Qt
 from PySide6.QtWidgets import QMainWindow, QSystemTrayIcon, QVBoxLayout, QWidget, QApplication
 
-from utils import check_work_path, dbg, save_config_backup
-from window.settings_dialog import SettingsDialog
+from utils import check_work_path, dbg, get_icon
 from app.timer.timer_view import TimerView
 
 # Check application location to differentiate icons
 if check_work_path():
-	window_icon = "icon_work"
+	window_icon = "work"
 else:
-	window_icon = "main_icon"
+	window_icon = "main"
 
 
 class InvisibleParent(QWidget):
@@ -40,7 +38,7 @@ class MainWindow(QMainWindow):
 		
 		# create_log_file()
 			
-		self.setWindowIcon(QIcon(f"lib/icons/{window_icon}.png"))
+		self.setWindowIcon(get_icon(window_icon))
 		
 		# Recovers backup and configures options
 		self.settings()
@@ -59,7 +57,9 @@ class MainWindow(QMainWindow):
 	#
 	def set_variables(self):
 		""" Defining variables for the application """
-		self.options_dialog = SettingsDialog(parent=self)
+		
+		# Settings window, created when it is opened for the first time
+		self.options_dialog = None
 		
 		pass
 	##
@@ -107,7 +107,7 @@ class MainWindow(QMainWindow):
 		
 		# Options menu
 		self.act_options = self.menu_file.addAction("Settings")
-		self.act_options.setIcon(QIcon("lib/icons/opt.png"))
+		self.act_options.setIcon(get_icon("options"))
 	##
 	
 	#
@@ -122,31 +122,53 @@ class MainWindow(QMainWindow):
 	
 	#
 	def set_default_values(self):
-		""" """
-		pass
+		""" Applies the display options to the timer view """
+		self.timer_view.set_centiseconds(self.config["centiseconds"])
 	##
 	
 	#
 	def settings(self):
 		""" Retrieves and applies options from the backup file. """
-		from utils import check_config_backup, get_config_backup, set_stylesheet
-		
-		check_config_backup()
-		
-		# Recovers options from backup file
-		self.config = get_config_backup()
+		from utils import get_config_store
 		
-		self.config["geoy"] += 30
+		# Recovers options from backup file, read and checked once
+		self.config = get_config_store()
+		self.config.subscribe(self.config_changed)
 		
-		self.setGeometry(self.config["geox"], self.config["geoy"], self.config["geow"], self.config["geoh"])
+		self.setGeometry(self.config["geox"], self.config["geoy"] + 30, self.config["geow"], self.config["geoh"])
 		
 		# Applying CSS styling
-		set_stylesheet(self, f"lib/style/{self.config['style']}.qss")
+		self.apply_style(self.config["style"])
+	##
+	
+	#
+	def config_changed(self, key, value):
+		""" Applies a modified option
+			> When an option of the config store changes
+		"""
+		if key == "style":
+			self.apply_style(value)
+		elif key == "centiseconds":
+			self.timer_view.set_centiseconds(value)
+	##
+	
+	#
+	def apply_style(self, style):
+		""" Applies the stylesheet of a style, "Default" removes it """
+		from utils import set_stylesheet
+		
+		if style == "Default":
+			self.setStyleSheet("")
+			return
+		set_stylesheet(self, f"lib/style/{style}.qss")
 	##
 	
 	#
 	def open_settings(self):
 		""" Opens the options window """
+		if self.options_dialog is None:
+			from window.settings_dialog import SettingsDialog
+			self.options_dialog = SettingsDialog(parent=self)
 		self.options_dialog.show()
 	##
 	
@@ -155,7 +177,7 @@ class MainWindow(QMainWindow):
 		""" Creating the system icon """
 		self.tray = QSystemTrayIcon()
 		try:
-			self.tray.setIcon(QIcon(f"lib/icons/{window_icon}.png"))
+			self.tray.setIcon(get_icon(window_icon))
 			self.tray.setVisible(True)
 			
 		# Trigger a notification message when the icon is not created
@@ -177,6 +199,15 @@ class MainWindow(QMainWindow):
 			self.activateWindow()
 	##
 	
+	#
+	def changeEvent(self, event):
+		""" Adapts the refresh of the timers when the window is minimized or restored """
+		super().changeEvent(event)
+		
+		if event.type() == QEvent.WindowStateChange:
+			self.timer_view.update_refresh()
+	##
+	
 	#
 	def closeEvent(self, event):
 		""" Closing the application """
@@ -185,10 +216,11 @@ class MainWindow(QMainWindow):
 		self.timer_view.close()
 		
 		if self.config["save_pos"]:
-			self.config["geox"], self.config["geoy"] = self.pos().x(), self.pos().y()
-			self.config["geow"], self.config["geoh"] = self.width(), self.height()
+			self.config.update({"geox": self.pos().x(), "geoy": self.pos().y(),
+								"geow": self.width(), "geoh": self.height()})
 		
-		save_config_backup(self.config)
+		# Only written if an option has changed
+		self.config.save()
 		
 		# Closing the parent window
 		QApplication.quit()
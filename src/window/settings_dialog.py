@@ -6,10 +6,9 @@
 
 from pathlib import Path
 
-from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import QDialog, QComboBox, QVBoxLayout, QLabel, QPushButton, QCheckBox, QHBoxLayout
 
-from utils import set_stylesheet, base_config
+from utils import base_config, get_icon
 
 
 class SettingsDialog(QDialog):
@@ -18,7 +17,7 @@ class SettingsDialog(QDialog):
 	def __init__(self, parent=None):
 		super().__init__(parent)
 		
-		self.setWindowIcon(QIcon("lib/icons/opt.png"))
+		self.setWindowIcon(get_icon("options"))
 		self.setWindowTitle('Settings')
 		self.setModal(True) # Makes the window modal (blocks the rest of the application)
 		
@@ -56,6 +55,15 @@ class SettingsDialog(QDialog):
 		
 		self.btn_reset_pos = QPushButton("Reset")
 		self.option_position_layout.addWidget(self.btn_reset_pos)
+		
+		# Precision of the remaining time option
+		self.label_option_display = QLabel("Remaining time:")
+		self.layout.addWidget(self.label_option_display)
+		
+		self.cb_option_centiseconds = QCheckBox("Hundredths of a second")
+		self.cb_option_centiseconds.setToolTip("If unchecked, the remaining time is displayed in whole seconds"
+											   " and refreshed every second.")
+		self.layout.addWidget(self.cb_option_centiseconds)
 	
 	def setup_connections(self):
 		""" Connects signals to slots """
@@ -64,6 +72,8 @@ class SettingsDialog(QDialog):
 		self.cb_option_position.clicked.connect(self.set_option_position)
 		
 		self.btn_reset_pos.clicked.connect(self.reset_position)
+		
+		self.cb_option_centiseconds.clicked.connect(self.set_option_centiseconds)
 	
 	def set_default_values(self):
 		""" Set default values for widgets. """
@@ -76,22 +86,23 @@ class SettingsDialog(QDialog):
 		
 		# Activates position option according to config
 		self.cb_option_position.setChecked(self.main_window.config['save_pos'])
+		
+		# Activates the precision option according to config
+		self.cb_option_centiseconds.setChecked(self.main_window.config['centiseconds'])
 	
 	def set_option_position(self):
 		""" Modifies the option to save the position of the window. """
 		self.main_window.config["save_pos"] = self.cb_option_position.isChecked()
 	
+	def set_option_centiseconds(self):
+		""" Modifies the precision of the remaining time, the main window applies it """
+		self.main_window.config["centiseconds"] = self.cb_option_centiseconds.isChecked()
+	
 	def reset_position(self):
 		""" Resets the position of the window. """
 		# Must restore window and config to positions found in base config
 		self.main_window.setGeometry(base_config["geox"], base_config["geoy"], base_config["geow"], base_config["geoh"])
 	
 	def set_style(self):
-		""" """
-		style = self.cbb_style.currentText()
-		if style == "Default":
-			self.main_window.config['style'] = style
-			self.main_window.setStyleSheet("")
-			return
-		self.main_window.config['style'] = style
-		set_stylesheet(self.main_window, f"lib/style/{style}.qss")
+		""" Changes the style option, the main window applies it """
+		self.main_window.config['style'] = self.cbb_style.currentText()